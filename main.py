@@ -1,75 +1,61 @@
+import asyncio
+import atexit
 import logging
-import os
+import queue
 import time
 from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 from typing import Any
 
-from walter.LLM_API import LLMAPI
-from walter.config import (
-    API_WALLET_PRIVATE_KEY,
-    COIN,
-    GENERAL_PUBLIC_KEY,
-    HYPERLIQUID_URL,
-    LLM_HISTORY_LENGTH,
-    LLM_MODEL,
-    OPENROUTER_API_KEY,
-    SCHEDULER_INTERVAL_SECONDS,
-    TOTAL_SESSION_HOURS,
-)
+from walter.LLM_API import LLMAPI, LLMDecision
+from walter.config import CFG
 from walter.dashboard import TradingDashboard, fmt_money, fmt_num
-from walter.db_utils import (
-    initialize_database,
-    save_account_snapshot,
-    save_market_snapshot,
-    save_news_snapshot,
-    save_order_attempt,
-)
+from walter import db_writer
+from walter.db_utils import initialize_database
 from walter.hyperliquid_API import (
     close_position,
     get_open_position_details,
     get_withdrawable_balance,
     place_order,
 )
-from walter.market_data import get_market_snapshot
+from walter.market_data import get_market_snapshots_batch
 from walter.news_aggregator import CryptoNewsAggregator
 from walter.news_summarizer import get_summaries_from_news
 from walter.web_dashboard import WebDashboardServer
 
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    datefmt="%Y-%m-%dT%H:%M:%S%z",
-    handlers=[
-        logging.FileHandler("walter.log", encoding="utf-8"),
-        logging.StreamHandler()
-    ]
+# Records are queued by the caller and written by a listener thread, keeping
+# file/console I/O off the decision-to-order path.
+_log_formatter = logging.Formatter(
+    "%(asctime)s [%(levelname)s] %(message)s", datefmt="%Y-%m-%dT%H:%M:%S%z"
 )
+_log_handlers: list[logging.Handler] = [
+    logging.FileHandler("walter.log", encoding="utf-8"),
+    logging.StreamHandler(),
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_log_listener = QueueListener(_log_queue, *_log_handlers)
+_queue_handler = QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter("%(message)s"))
+logging.basicConfig(level=CFG.log_level, handlers=[_queue_handler])
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger(__name__)
 
-interval = int(SCHEDULER_INTERVAL_SECONDS)
-coin = str(COIN)
-hyperliquid_url = str(HYPERLIQUID_URL)
-general_public_key = str(GENERAL_PUBLIC_KEY)
-api_wallet_private_key = str(API_WALLET_PRIVATE_KEY)
-llm_model = LLM_MODEL
-openrouter_key = OPENROUTER_API_KEY
-history_length = int(LLM_HISTORY_LENGTH)
 llm_api = LLMAPI(
-    api_key=openrouter_key,
-    model=llm_model,
-    history_length=history_length,
+    api_key=CFG.openrouter_api_key,
+    model=CFG.llm_model,
+    history_length=CFG.history_length,
+    structured_output=CFG.llm_structured_output,
 )
-total_session_hours = int(TOTAL_SESSION_HOURS)
-total_cycles = (total_session_hours * 3600) // interval
+# A stuck LLM call must not eat into the following cycle.
+llm_timeout = CFG.interval * 0.8
 initialize_database()
 
-web_dashboard_enabled = os.getenv("WALTER_ENABLE_WEB_DASHBOARD", "1") != "0"
-web_dashboard_host = os.getenv("WALTER_WEB_HOST", "localhost")
-try:
-    web_dashboard_port = int(os.getenv("WALTER_WEB_PORT", "8765"))
-except ValueError:
-    web_dashboard_port = 8765
+BUY_ACTION = "buy"
+DEFAULT_TIF = "Ioc"
 
 
 def _persist_cycle(
@@ -83,35 +69,56 @@ def _persist_cycle(
     order_placed: bool | None = None,
     decision_action_override: str | None = None,
 ) -> None:
-    """Save all snapshots and the order attempt for a single loop iteration."""
-    account_snapshot_id = save_account_snapshot(current_time, account_snapshot)
-    market_snapshot_id = save_market_snapshot(market_snapshot, captured_at=current_time)
-    news_snapshot_id = save_news_snapshot(major_titles, captured_at=current_time)
-    save_order_attempt(
-        created_at=current_time,
-        coin=coin,
-        is_buy=order_args["is_buy"] if order_args else False,
-        size=order_args["size"] if order_args else None,
-        leverage=order_args["leverage"] if order_args else None,
-        tif=order_args["tif"] if order_args else None,
-        decision_action=decision_action_override or decision.action,
-        thinking=decision.thinking,
-        market_snapshot_id=market_snapshot_id,
-        news_snapshot_id=news_snapshot_id,
-        account_snapshot_id=account_snapshot_id,
-        order_payload=order_args,
-        order_placed=order_placed,
+    """Queue all snapshots and the order attempt for a single loop iteration.
+
+    The writes happen on the background db_writer thread, off the cycle's
+    critical path.
+    """
+    db_writer.enqueue(
+        {
+            "captured_at": current_time,
+            "market": market_snapshot,
+            "account": account_snapshot,
+            "news": major_titles,
+            "order": {
+                "coin": CFG.coin,
+                "is_buy": order_args["is_buy"] if order_args else False,
+                "size": order_args["size"] if order_args else None,
+                "leverage": order_args["leverage"] if order_args else None,
+                "tif": order_args["tif"] if order_args else None,
+                "decision_action": decision_action_override or decision.action,
+                "thinking": decision.thinking,
+                "order_payload": order_args,
+                "order_placed": order_placed,
+            },
+        }
     )
 
 
-def main() -> None:
-    logger.info("Scheduler running every %d seconds.", interval)
+async def _sleep_until_next_cycle(cycle_start: float) -> None:
+    """Sleep for whatever is left of the interval that began at *cycle_start*.
+
+    Keeps cycles phase-locked to the schedule instead of drifting by the time
+    each iteration spent fetching data and waiting on the LLM.
+    """
+    await asyncio.sleep(max(0.0, CFG.interval - (time.monotonic() - cycle_start)))
+
+
+def _collect_news() -> list[str]:
+    """Fetch the latest news and return the titles of the major narratives."""
+    news = CryptoNewsAggregator.get_aggregated_news()
+    summary = get_summaries_from_news(news)
+    return [n.get("title", "") for n in summary.get("major_narratives", [])]
+
+
+async def main() -> None:
+    logger.info("Scheduler running every %d seconds.", CFG.interval)
     web_dashboard: WebDashboardServer | None = None
-    if web_dashboard_enabled:
+    if CFG.web_dashboard_enabled:
         try:
             web_dashboard = WebDashboardServer(
-                host=web_dashboard_host,
-                port=web_dashboard_port,
+                host=CFG.web_dashboard_host,
+                port=CFG.web_dashboard_port,
             )
             web_dashboard.start()
             logger.info("Web dashboard available at %s", web_dashboard.url)
@@ -119,8 +126,8 @@ def main() -> None:
             logger.warning("Web dashboard disabled (bind failed): %s", exc)
             web_dashboard = None
 
-    dashboard = TradingDashboard(coin, web_dashboard=web_dashboard)
-    dashboard.add_event(f"Scheduler started (interval={interval}s)")
+    dashboard = TradingDashboard(CFG.coin, web_dashboard=web_dashboard)
+    dashboard.add_event(f"Scheduler started (interval={CFG.interval}s)")
     if web_dashboard is not None:
         dashboard.add_event(f"Web dashboard: {web_dashboard.url}")
     dashboard.set_state(stage="initializing")
@@ -129,39 +136,73 @@ def main() -> None:
 
     try:
         while True:
+            cycle_start = time.monotonic()
             try:
                 cycle += 1
                 current_time = datetime.now(timezone.utc)
                 dashboard.set_state(
-                    stage="collecting_news",
+                    stage="collecting_data",
                     cycle=cycle,
                     current_time=current_time,
                     order_status="pending",
                 )
                 logger.info("--- Starting Cycle %d ---", cycle)
-                logger.info("Collecting news and market data...")
+                logger.info("Collecting news, market and account data...")
 
-                news = CryptoNewsAggregator.get_aggregated_news()
-                summary = get_summaries_from_news(news)
-                major_titles = [n.get("title", "") for n in summary.get("major_narratives", [])]
-                dashboard.set_state(major_titles=major_titles, stage="collecting_market")
+                # News, market and account fetches are independent, so run them
+                # concurrently; the cycle waits on the slowest instead of the sum.
+                # OpenRouter is connected meanwhile on the first cycle; warm_up
+                # returns at once after that and never raises.
+                major_titles, market_snapshots, account_snapshot, _ = await asyncio.gather(
+                    asyncio.to_thread(_collect_news),
+                    get_market_snapshots_batch(
+                        [CFG.coin], CFG.interval, CFG.hyperliquid_url, 24
+                    ),
+                    asyncio.to_thread(
+                        get_open_position_details,
+                        CFG.hyperliquid_url,
+                        CFG.general_public_key,
+                    ),
+                    asyncio.to_thread(llm_api.warm_up),
+                )
+                market_snapshot = market_snapshots[CFG.coin]
+                if "error" in market_snapshot:
+                    # Incomplete market data; skip the cycle via the loop error path.
+                    raise RuntimeError(market_snapshot["error"])
+                dashboard.set_state(
+                    major_titles=major_titles,
+                    market_snapshot=market_snapshot,
+                    account_snapshot=account_snapshot,
+                    stage="llm_decision",
+                )
                 dashboard.add_event(f"News processed ({len(major_titles)} major narratives)")
                 logger.info("News processed: %d major narratives found.", len(major_titles))
-
-                market_snapshot = get_market_snapshot(coin, interval, hyperliquid_url, 24)
-                dashboard.set_state(market_snapshot=market_snapshot, stage="collecting_account")
                 logger.info("Market data fetched. Current Price: $%.2f", market_snapshot.get("current_price", 0))
-
-                account_snapshot = get_open_position_details(
-                    hyperliquid_url, general_public_key
-                )
-                dashboard.set_state(account_snapshot=account_snapshot, stage="llm_decision")
                 logger.info("Account data fetched. Requesting LLM decision...")
 
-                decision = llm_api.decide_from_market(
-                    market_snapshot, account_snapshot, major_titles,
-                    current_cycle=cycle, total_cycles=total_cycles
-                )
+                try:
+                    decision = await asyncio.wait_for(
+                        llm_api.decide_from_market_async(
+                            market_snapshot, account_snapshot, major_titles,
+                            current_cycle=cycle, total_cycles=CFG.total_cycles
+                        ),
+                        timeout=llm_timeout,
+                    )
+                except asyncio.TimeoutError:
+                    logger.warning(
+                        "LLM decision timed out after %.0fs; holding this cycle.",
+                        llm_timeout,
+                    )
+                    decision = LLMDecision(
+                        action="hold",
+                        thinking="LLM decision timed out",
+                        execute=False,
+                        raw_response="",
+                        size=None,
+                        leverage=None,
+                        tif=None,
+                        llm_input=None,
+                    )
                 dashboard.set_state(decision=decision, stage="decision_ready")
                 dashboard.add_event(
                     f"Decision={decision.action.upper()} size={decision.size} lev={decision.leverage}"
@@ -191,17 +232,17 @@ def main() -> None:
                     )
                     dashboard.add_event("HOLD: no order placed", current_time)
                     logger.info("Action is HOLD. No order placed. Waiting for next cycle.")
-                    time.sleep(interval)
+                    await _sleep_until_next_cycle(cycle_start)
                     continue
 
                 if decision.action == "close":
                     dashboard.set_state(stage="closing_position", order_status="closing")
                     logger.info("Action is CLOSE. Attempting to close open position...")
                     closed = close_position(
-                        hyperliquid_url,
-                        api_wallet_private_key,
-                        general_public_key,
-                        coin,
+                        CFG.hyperliquid_url,
+                        CFG.api_wallet_private_key,
+                        CFG.general_public_key,
+                        CFG.coin,
                     )
                     _persist_cycle(
                         current_time,
@@ -218,7 +259,7 @@ def main() -> None:
                             required_margin=None,
                             available_balance=None,
                         )
-                        dashboard.add_event(f"CLOSE: {coin} position closed", current_time)
+                        dashboard.add_event(f"CLOSE: {CFG.coin} position closed", current_time)
                         logger.info("Position closed successfully.")
                     else:
                         dashboard.set_state(
@@ -229,15 +270,16 @@ def main() -> None:
                         )
                         dashboard.add_event("CLOSE: no position to close or failed", current_time)
                         logger.info("CLOSE failed or no position to close.")
-                    time.sleep(interval)
+                    await _sleep_until_next_cycle(cycle_start)
                     continue
 
+                is_buy = decision.action == BUY_ACTION
                 order_args = {
-                    "is_buy": decision.action == "buy",
-                    "coin": coin,
+                    "is_buy": is_buy,
+                    "coin": CFG.coin,
                     "size": decision.size,
                     "leverage": decision.leverage,
-                    "tif": decision.tif or "Ioc",
+                    "tif": decision.tif or DEFAULT_TIF,
                 }
 
                 if (
@@ -266,7 +308,7 @@ def main() -> None:
                         order_placed=False,
                         decision_action_override=f"{decision.action}_invalid_payload",
                     )
-                    time.sleep(interval)
+                    await _sleep_until_next_cycle(cycle_start)
                     continue
 
                 available = get_withdrawable_balance(account_snapshot)
@@ -327,19 +369,19 @@ def main() -> None:
                         ),
                         current_time,
                     )
-                    time.sleep(interval)
+                    await _sleep_until_next_cycle(cycle_start)
                     continue
 
                 dashboard.set_state(stage="placing_order", order_status="submitting_order")
-                logger.info("Placing %s order for %s %s @ %sx lev", decision.action.upper(), decision.size, coin, decision.leverage)
+                logger.info("Placing %s order for %s %s @ %sx lev", decision.action.upper(), order_args["size"], CFG.coin, order_args["leverage"])
                 order_placed = place_order(
-                    hyperliquid_url,
-                    api_wallet_private_key,
-                    order_args["is_buy"],
-                    coin,
+                    CFG.hyperliquid_url,
+                    CFG.api_wallet_private_key,
+                    is_buy,
+                    CFG.coin,
                     order_args["size"],
-                    decision.leverage,
-                    decision.tif,
+                    order_args["leverage"],
+                    order_args["tif"],
                 )
                 if order_placed:
                     _persist_cycle(
@@ -358,7 +400,7 @@ def main() -> None:
                     dashboard.add_event(
                         (
                             f"Order placed: {decision.action.upper()} "
-                            f"{fmt_num(decision.size, 5)} {coin} @ lev {decision.leverage}"
+                            f"{fmt_num(decision.size, 5)} {CFG.coin} @ lev {decision.leverage}"
                         ),
                         current_time,
                     )
@@ -370,21 +412,30 @@ def main() -> None:
                     )
                     dashboard.add_event("Order placement failed", current_time)
                     logger.error("Order placement failed.")
-                time.sleep(interval)
+                await _sleep_until_next_cycle(cycle_start)
             except Exception as e:
                 logger.error("Loop error: %s", e, exc_info=True)
                 dashboard.add_event(f"Loop error: {e}")
                 dashboard.set_state(stage="error_state", order_status="error")
-                logger.info("Retrying in %d seconds", interval)
-                time.sleep(interval)
-    except KeyboardInterrupt:
+                logger.info(
+                    "Retrying in %d seconds",
+                    max(0, CFG.interval - (time.monotonic() - cycle_start)),
+                )
+                await _sleep_until_next_cycle(cycle_start)
+    except (KeyboardInterrupt, asyncio.CancelledError):
         dashboard.add_event("Scheduler stopped by user")
         dashboard.set_state(stage="stopped", order_status="stopped")
         logger.info("Scheduler stopped by user.")
     finally:
+        if not db_writer.flush(timeout=5):
+            logger.warning("Timed out waiting for pending database writes.")
+        llm_api.close()
         if web_dashboard is not None:
             web_dashboard.stop()
 
 
 if __name__ == "__main__":
-    main()
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -1,24 +1,150 @@
 from __future__ import annotations
 
+import asyncio
+import functools
 import logging
-import re
-import json
+import string
 from dataclasses import dataclass
 from typing import Any
 
+import orjson
 import requests
-
-from walter.db_utils import get_recent_decisions
-from walter.config import SCHEDULER_INTERVAL_SECONDS
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from walter.db_utils import get_latest_decision_id, get_recent_decisions
+from walter.config import (
+    OPENROUTER_API_KEY,
+    SCHEDULER_INTERVAL_SECONDS,
+    TOTAL_SESSION_HOURS,
+)
 
 logger = logging.getLogger(__name__)
 
+# OpenRouter structured-output schema mirroring the reply shape SYSTEM_PROMPT
+# asks for. Strict mode needs every key required, so ACTION_DETAILS is null
+# for HOLD/CLOSE.
+DECISION_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "trade_decision",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "additionalProperties": False,
+            "required": ["THINKING", "ACTION", "ACTION_DETAILS"],
+            "properties": {
+                "THINKING": {"type": "string"},
+                "ACTION": {"type": "string", "enum": ["BUY", "SELL", "HOLD", "CLOSE"]},
+                "ACTION_DETAILS": {
+                    "anyOf": [
+                        {
+                            "type": "object",
+                            "additionalProperties": False,
+                            "required": ["size", "leverage", "tif"],
+                            "properties": {
+                                "size": {"type": "number"},
+                                "leverage": {"type": "integer"},
+                                "tif": {"type": "string"},
+                            },
+                        },
+                        {"type": "null"},
+                    ]
+                },
+            },
+        },
+    },
+}
+
+# Per-call session position; sent at the top of the user message so the
+# system prompt stays byte-identical (and cacheable) across calls.
+CYCLE_LINE = "You are at check-in #{current_cycle} of {total_cycles}."
+
+# Characters of the optional language tag after an opening ``` fence.
+_FENCE_TAG_CHARS = string.ascii_letters + string.digits + "_"
+
+@functools.lru_cache(maxsize=4)
+def _shared_session(api_key: str) -> requests.Session:
+    """Process-wide OpenRouter session per API key.
+
+    Shared by every ``LLMAPI`` instance so the keep-alive TLS connection
+    survives re-instantiation. Decisions run one at a time per cycle, which
+    keeps use of the session effectively serial.
+    """
+    session = requests.Session()
+    # Transient OpenRouter errors are retried on the same pooled connection.
+    # Only 429/5xx statuses and failed connects are retried: read=0 keeps a
+    # read timeout on the billed, non-idempotent completion POST from being
+    # replayed. raise_on_status=False hands the last response back so
+    # _call_openrouter still logs and raises it.
+    retry = Retry(
+        total=2,
+        connect=2,
+        read=0,
+        backoff_factor=0.2,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"POST"}),
+        raise_on_status=False,
+    )
+    session.mount(
+        "https://",
+        HTTPAdapter(pool_connections=2, pool_maxsize=4, max_retries=retry),
+    )
+    session.headers.update(
+        {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+            "HTTP-Referer": "https://github.com/auxiliary-ai/walter",
+            "X-Title": "Walter Trading Bot",
+        }
+    )
+    return session
+
+
+class _JsonObjectScanner:
+    """Tracks brace depth across streamed text to spot where a JSON object ends."""
+
+    def __init__(self) -> None:
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, text: str) -> bool:
+        """Consume *text*; returns True once the top-level object has closed."""
+        for ch in text:
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == "\\":
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                self.in_string = True
+            elif ch == "{":
+                self.depth += 1
+            elif ch == "}" and self.depth > 0:
+                self.depth -= 1
+                if self.depth == 0:
+                    return True
+        return False
+
+
+# Upper-cased ACTION values the model may return -> normalized action.
+# Anything else is treated as "hold".
+_ACTION_ALIASES = {
+    "BUY": "buy",
+    "LONG": "buy",
+    "SELL": "sell",
+    "SHORT": "sell",
+    "CLOSE": "close",
+}
+
 # Stable system prompt — sent once per API call as the system role.
 # Keeps instructions out of the user message to reduce per-call token usage.
 SYSTEM_PROMPT = (
     "You are a disciplined ETH perpetual-futures trader managing a {total_session_hours}-hour session. "
     "We check in every {interval_minutes} minutes. "
-    "You are at check-in #{current_cycle} of {total_cycles}. "
     "Your objective is to maximize total REALISED profit by the end of the session, not to avoid emotional pain, not to defend past decisions, and not to always be in a trade.\n\n"
 
     "You receive:\n"
@@ -114,7 +240,7 @@ SYSTEM_PROMPT = (
     "- ACTION must be one of BUY, SELL, HOLD, CLOSE.\n"
     '- Include ACTION_DETAILS only for BUY or SELL.\n'
     '- ACTION_DETAILS must contain: {{"size": <float>, "leverage": <int>, "tif": "Ioc"}}.\n'
-    '- Omit ACTION_DETAILS for HOLD and CLOSE.\n\n'
+    '- Omit ACTION_DETAILS (or set it to null) for HOLD and CLOSE.\n\n'
 
     'Return exactly this shape:\n'
     '{{"THINKING":"<1 sentence>","ACTION":"BUY|SELL|HOLD|CLOSE","ACTION_DETAILS":{{"size":<float>,"leverage":<int>,"tif":"Ioc"}}}}'
@@ -122,7 +248,48 @@ SYSTEM_PROMPT = (
 )
 
 
-@dataclass(frozen=True)
+_DecisionFields = tuple[str, str | None, float | None, int | None, str | None]
+
+
+def _decision_fields(response_data: dict) -> _DecisionFields:
+    """Normalized (action, thinking, size, leverage, tif) from a decoded reply."""
+    thinking = response_data.get("THINKING")
+    action = response_data.get("ACTION", "HOLD").upper()
+
+    details = response_data.get("ACTION_DETAILS") or {}
+    size = details.get("size")
+    leverage = details.get("leverage")
+    tif = details.get("tif")
+
+    return (
+        _ACTION_ALIASES.get(action, "hold"),
+        thinking,
+        float(size) if size is not None else None,
+        int(leverage) if leverage is not None else None,
+        tif,
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_decision_text(raw_response: str) -> _DecisionFields:
+    """Parse a raw reply once; replays of the same text reuse the result."""
+    response_data: dict = {}
+    clean_text = raw_response.strip()
+    # Strip markdown code fences (```json ... ```) if present
+    if clean_text.startswith("```"):
+        clean_text = clean_text[3:].lstrip(_FENCE_TAG_CHARS).lstrip()
+        if clean_text.endswith("```"):
+            clean_text = clean_text[:-3].rstrip()
+
+    try:
+        response_data = orjson.loads(clean_text)
+    except orjson.JSONDecodeError:
+        logger.warning("Failed to parse LLM response as JSON: %s", clean_text[:200])
+
+    return _decision_fields(response_data)
+
+
+@dataclass(frozen=True, slots=True)
 class LLMDecision:
     """Represents the trading decision returned by the LLM."""
 
@@ -147,6 +314,7 @@ class LLMAPI:
         request_timeout: float = 30.0,
         temperature: float = 0.2,
         history_length: int = 5,
+        structured_output: bool = True,
     ) -> None:
         """
         Initialize the LLM API client using OpenRouter.
@@ -157,12 +325,11 @@ class LLMAPI:
             request_timeout: HTTP request timeout in seconds
             temperature: Sampling temperature for the LLM
             history_length: Number of recent decisions to include in context
+            structured_output: Request schema-constrained JSON (response_format)
         """
         self.request_timeout = request_timeout
         self.temperature = temperature
 
-        from walter.config import OPENROUTER_API_KEY
-
         key = api_key or OPENROUTER_API_KEY
         if not key:
             raise ValueError(
@@ -173,6 +340,41 @@ class LLMAPI:
         self.model = model
         self.endpoint = "https://openrouter.ai/api/v1/chat/completions"
         self.history_length = history_length
+        self.structured_output = structured_output
+
+        self._session = _shared_session(self.api_key)
+        self._warmed_up = False
+
+        # SYSTEM_PROMPT only depends on session config, so render it once.
+        self._system_prompt = SYSTEM_PROMPT.format(
+            total_session_hours=TOTAL_SESSION_HOURS,
+            interval_minutes=SCHEDULER_INTERVAL_SECONDS // 60,
+        )
+        self._history_key: int | None = None
+        self._history_text = ""
+
+    def close(self) -> None:
+        """Close pooled OpenRouter connections.
+
+        The session is process-wide (``_shared_session``), so this drops the
+        idle connections of every ``LLMAPI`` using the same API key; the
+        session stays usable and reconnects on the next request.
+        """
+        self._session.close()
+
+    def warm_up(self) -> None:
+        """Open the connection to OpenRouter ahead of the first decision.
+
+        Safe to call more than once; failures are logged and otherwise ignored
+        since the first real request will simply connect on its own.
+        """
+        if self._warmed_up:
+            return
+        try:
+            self._session.head(self.endpoint, timeout=self.request_timeout)
+            self._warmed_up = True
+        except requests.RequestException as e:
+            logger.debug("OpenRouter warm-up failed: %s", e)
 
     # ------------------------------------------------------------------
     # Prompt building
@@ -180,9 +382,15 @@ class LLMAPI:
 
     def _build_history_block(self) -> str:
         """Compact history table with price deltas for P&L feedback."""
-        rows = get_recent_decisions(self.history_length)
-        if not rows:
+        # The history only changes when a new decision is persisted, so check
+        # the newest id before running the full history query.
+        key = get_latest_decision_id()
+        if key is None:
             return ""
+        if key == self._history_key:
+            return self._history_text
+
+        rows = get_recent_decisions(self.history_length)
 
         lines = ["Recent decisions (oldest → newest):"]
         prev_price = None
@@ -204,7 +412,10 @@ class LLMAPI:
             )
             if price is not None:
                 prev_price = price
-        return "\n".join(lines)
+
+        self._history_key = key
+        self._history_text = "\n".join(lines)
+        return self._history_text
 
     @staticmethod
     def _format_account_summary(account_snapshot: dict) -> str:
@@ -279,49 +490,19 @@ class LLMAPI:
     def decide(self, response: Any, llm_input: str | None = None) -> LLMDecision:
         """Converts an arbitrary LLM response into an actionable decision."""
         raw_response = str(response)
-        response_data: dict = {}
-
         if isinstance(response, dict):
-            response_data = response
+            fields = _decision_fields(response)
         else:
-            clean_text = raw_response.strip()
-            # Strip markdown code fences if present
-            if clean_text.startswith("```"):
-                clean_text = re.sub(r"^```\w*\s*", "", clean_text)
-                clean_text = re.sub(r"\s*```$", "", clean_text)
-
-            try:
-                response_data = json.loads(clean_text)
-            except json.JSONDecodeError:
-                logger.warning(
-                    "Failed to parse LLM response as JSON: %s", clean_text[:200]
-                )
-
-        thinking = response_data.get("THINKING")
-        action = response_data.get("ACTION", "HOLD").upper()
-
-        details = response_data.get("ACTION_DETAILS", {})
-        size = details.get("size")
-        leverage = details.get("leverage")
-        tif = details.get("tif")
-
-        normalized_action = "hold"
-        if action in ("BUY", "LONG"):
-            normalized_action = "buy"
-        elif action in ("SELL", "SHORT"):
-            normalized_action = "sell"
-        elif action == "CLOSE":
-            normalized_action = "close"
-
-        execute = normalized_action not in ("hold",)
+            fields = _parse_decision_text(raw_response)
+        action, thinking, size, leverage, tif = fields
 
         return LLMDecision(
-            action=normalized_action,
+            action=action,
             thinking=thinking,
-            execute=execute,
+            execute=action != "hold",
             raw_response=raw_response,
-            size=float(size) if size is not None else None,
-            leverage=int(leverage) if leverage is not None else None,
+            size=size,
+            leverage=leverage,
             tif=tif,
             llm_input=llm_input,
         )
@@ -343,47 +524,132 @@ class LLMAPI:
         response = self._call_openrouter(prompt, current_cycle=current_cycle, total_cycles=total_cycles)
         return self.decide(response, llm_input=prompt)
 
+    async def decide_from_market_async(
+        self,
+        market_snapshot: Any,
+        open_positions: Any,
+        news_titles: list[str] | None = None,
+        current_cycle: int = 1,
+        total_cycles: int = 1,
+    ) -> LLMDecision:
+        """Awaitable ``decide_from_market``; the blocking call runs in a worker thread.
+
+        Lets callers bound the whole decision with ``asyncio.wait_for``.
+        """
+        return await asyncio.to_thread(
+            self.decide_from_market,
+            market_snapshot,
+            open_positions,
+            news_titles,
+            current_cycle=current_cycle,
+            total_cycles=total_cycles,
+        )
+
     # ------------------------------------------------------------------
     # OpenRouter HTTP
     # ------------------------------------------------------------------
 
     def _call_openrouter(self, prompt: str, current_cycle: int = 1, total_cycles: int = 1) -> str:
         """Makes a request to OpenRouter API and returns the response text."""
-        from walter.config import TOTAL_SESSION_HOURS, SCHEDULER_INTERVAL_SECONDS
-        
-        interval_minutes = SCHEDULER_INTERVAL_SECONDS // 60
-        formatted_system_prompt = SYSTEM_PROMPT.format(
-            total_session_hours=TOTAL_SESSION_HOURS,
-            interval_minutes=interval_minutes,
-            current_cycle=current_cycle,
-            total_cycles=total_cycles,
+        cycle_line = CYCLE_LINE.format(
+            current_cycle=current_cycle, total_cycles=total_cycles
         )
 
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-            "HTTP-Referer": "https://github.com/auxiliary-ai/walter",
-            "X-Title": "Walter Trading Bot",
-        }
-
         payload = {
             "model": self.model,
             "messages": [
-                {"role": "system", "content": formatted_system_prompt},
-                {"role": "user", "content": prompt},
+                {
+                    "role": "system",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": self._system_prompt,
+                            # Prompt-caching hint for providers that need it
+                            # (Anthropic, Gemini); others cache prefixes
+                            # automatically or ignore it.
+                            "cache_control": {"type": "ephemeral"},
+                        }
+                    ],
+                },
+                {"role": "user", "content": f"{cycle_line}\n{prompt}"},
             ],
             "temperature": self.temperature,
+            "stream": True,
         }
+        if self.structured_output:
+            payload["response_format"] = DECISION_RESPONSE_FORMAT
+
+        return self._post_completion(payload)
+
+    def _post_completion(self, payload: dict) -> str:
+        """POSTs *payload* once and returns the reply text."""
+        stream = bool(payload.get("stream"))
+        # Encoded with orjson; the session already sends the JSON Content-Type.
+        with self._session.post(
+            self.endpoint,
+            data=orjson.dumps(payload),
+            timeout=self.request_timeout,
+            stream=stream,
+        ) as response:
+            if not response.ok:
+                logger.error(
+                    "OpenRouter Error: %d - %s", response.status_code, response.text
+                )
+            response.raise_for_status()
+            if not response.headers.get("Content-Type", "").startswith(
+                "text/event-stream"
+            ):
+                return self._parse_response(orjson.loads(response.content))
+            return self._read_stream(response)
 
-        response = requests.post(
-            self.endpoint, headers=headers, json=payload, timeout=self.request_timeout
-        )
-        if not response.ok:
-            logger.error(
-                "OpenRouter Error: %d - %s", response.status_code, response.text
+    @staticmethod
+    def _read_stream(response: requests.Response) -> str:
+        """Collects streamed content deltas, stopping once the JSON reply closes.
+
+        The model answers with a single JSON object, so anything after its
+        closing brace is not needed. Leaving the ``with`` block with the body
+        unread closes the socket rather than returning it to the pool, so the
+        next call pays a fresh TLS handshake; that is accepted because it cuts
+        off generation (and its tokens/latency) right away.
+
+        A broken stream (in-band error, dropped connection, malformed event or
+        EOF inside the object) is never re-requested, since the completion is
+        billed and not idempotent. Whatever text arrived is returned instead;
+        an incomplete object fails to parse and ``decide`` falls back to HOLD.
+        """
+        parts: list[str] = []
+        scanner = _JsonObjectScanner()
+        try:
+            for line in response.iter_lines():
+                # Skip SSE comments/keep-alives such as ": OPENROUTER PROCESSING".
+                if not line.startswith(b"data:"):
+                    continue
+                data = line[5:].strip()
+                if data == b"[DONE]":
+                    break
+
+                chunk = orjson.loads(data)
+                if "error" in chunk:
+                    logger.error("OpenRouter stream error: %s", chunk["error"])
+                    break
+                choices = chunk.get("choices") or []
+                if not choices:
+                    continue
+                content = (choices[0].get("delta") or {}).get("content")
+                if content:
+                    parts.append(content)
+                    if scanner.feed(content):
+                        break
+        except (requests.RequestException, orjson.JSONDecodeError) as e:
+            logger.error("OpenRouter stream broke: %s", e)
+
+        text = "".join(parts).strip()
+        if scanner.depth > 0:
+            logger.warning(
+                "OpenRouter stream ended inside the reply (%d chars received)",
+                len(text),
             )
-        response.raise_for_status()
-        return self._parse_response(response.json())
+        return text
 
     @staticmethod
     def _parse_response(payload: dict) -> str:
@@ -1,13 +1,22 @@
 """Top-level package for the Walter trading toolkit."""
 
-from .LLM_API import LLMAPI, LLMDecision
-from .hyperliquid_API import (
-    get_open_position_details,
-    place_order,
-    get_withdrawable_balance,
-)
-from .market_data import get_market_snapshot
-from .news_aggregator import CryptoNewsAggregator
+import importlib
+from typing import Any
+
+# Public names -> defining submodule. Resolved on first attribute access
+# (PEP 562) so importing one submodule, e.g. ``walter.config``, does not pull
+# in the Hyperliquid SDK, NumPy and every other dependency.
+_EXPORTS = {
+    "LLMAPI": "walter.LLM_API",
+    "LLMDecision": "walter.LLM_API",
+    "get_open_position_details": "walter.hyperliquid_API",
+    "place_order": "walter.hyperliquid_API",
+    "get_withdrawable_balance": "walter.hyperliquid_API",
+    "get_market_snapshot": "walter.market_data",
+    "get_market_snapshot_async": "walter.market_data",
+    "get_market_snapshots_batch": "walter.market_data",
+    "CryptoNewsAggregator": "walter.news_aggregator",
+}
 
 __all__ = [
     "LLMAPI",
@@ -16,7 +25,22 @@ __all__ = [
     "place_order",
     "get_withdrawable_balance",
     "get_market_snapshot",
+    "get_market_snapshot_async",
+    "get_market_snapshots_batch",
     "CryptoNewsAggregator",
 ]
 
 __version__ = "0.1.0"
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
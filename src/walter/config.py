@@ -1,9 +1,19 @@
+import functools
+import logging
 import os
-from dotenv import load_dotenv
+from dataclasses import dataclass
 
-# Load environment variables (secrets)
-for dotenv_file in (".env.local", ".env"):
-    load_dotenv(dotenv_path=dotenv_file, override=False)
+from dotenv import dotenv_values
+
+# Environment variables (secrets), merged once without touching os.environ.
+# Precedence: process environment > .env.local > .env
+_ENV = {
+    key: value
+    for env_file in (".env", ".env.local")
+    for key, value in dotenv_values(env_file).items()
+    if value is not None
+}
+_ENV.update(os.environ)
 
 # Configuration Constants
 SCHEDULER_INTERVAL_SECONDS = 900
@@ -14,6 +24,9 @@ HYPERLIQUID_URL = "https://api.hyperliquid-testnet.xyz/info"
 LLM_MODEL = "deepseek/deepseek-v3.2"
 LLM_HISTORY_LENGTH = 5
 TOTAL_SESSION_HOURS = 6
+# Ask OpenRouter for schema-constrained JSON; disable for models without
+# structured-output support.
+LLM_STRUCTURED_OUTPUT = _ENV.get("LLM_STRUCTURED_OUTPUT", "1") != "0"
 
 # CryptoPanic Configuration
 CP_URL = "https://cryptopanic.com/api/developer/v2/posts/"
@@ -29,18 +42,96 @@ CC_LIMIT = 10
 
 # News Summarizer Configuration
 EPS = 0.85
+# Summaries are keyed on the exact set of headlines, so they can outlive a
+# scheduler interval; two intervals lets an unchanged feed skip re-clustering
+# on the next cycle.
+NEWS_SUMMARY_TTL = int(
+    _ENV.get("NEWS_SUMMARY_TTL", str(2 * SCHEDULER_INTERVAL_SECONDS))
+)  # seconds
+# Raw feed responses should stay fresh, so this is far below the scheduler
+# interval: it only absorbs repeated fetches within a cycle (or loops run with
+# a much shorter interval), not cycle-to-cycle calls.
+NEWS_RESPONSE_TTL = int(_ENV.get("NEWS_RESPONSE_TTL", "30"))  # seconds
 
 # Secrets (read from env)
-API_WALLET_PRIVATE_KEY = os.getenv("API_WALLET_PRIVATE_KEY")
-API_WALLET_PUBLIC_KEY = os.getenv("API_WALLET_PUBLIC_KEY")
-GENERAL_PUBLIC_KEY = os.getenv("GENERAL_PUBLIC_KEY")
+API_WALLET_PRIVATE_KEY = _ENV.get("API_WALLET_PRIVATE_KEY")
+API_WALLET_PUBLIC_KEY = _ENV.get("API_WALLET_PUBLIC_KEY")
+GENERAL_PUBLIC_KEY = _ENV.get("GENERAL_PUBLIC_KEY")
+
+SQLITE_DB_PATH = _ENV.get("SQLITE_DB_PATH", "walter.db")
 
-SQLITE_DB_PATH = os.getenv("SQLITE_DB_PATH", "walter.db")
+OPENROUTER_API_KEY = _ENV.get("OPENROUTER_API_KEY")
 
-OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
+CP_CRYPTOPANIC_KEY = _ENV.get("CP_CRYPTOPANIC_KEY")
+CC_CRYPTOCOMPARE_KEY = _ENV.get("CC_CRYPTOCOMPARE_KEY")
 
-CP_CRYPTOPANIC_KEY = os.getenv("CP_CRYPTOPANIC_KEY")
-CC_CRYPTOCOMPARE_KEY = os.getenv("CC_CRYPTOCOMPARE_KEY")
+# Logging level for the scheduler (DEBUG adds per-order SDK responses)
+try:
+    _LOG_LEVEL_NAMES = set(logging.getLevelNamesMapping())
+except AttributeError:  # Python 3.10
+    _LOG_LEVEL_NAMES = {logging.getLevelName(level) for level in range(0, 51, 10)}
+LOG_LEVEL = _ENV.get("WALTER_LOG_LEVEL", "INFO").upper()
+if LOG_LEVEL not in _LOG_LEVEL_NAMES:
+    # basicConfig raises ValueError on unknown names; fall back instead.
+    logging.getLogger(__name__).warning(
+        "Unknown WALTER_LOG_LEVEL %r; using INFO", LOG_LEVEL
+    )
+    LOG_LEVEL = "INFO"
 
 #Dashbord refresh rate in seconds
 DASHBOARD_REFRESH_RATE = 180
+
+# Local web dashboard
+WEB_DASHBOARD_ENABLED = _ENV.get("WALTER_ENABLE_WEB_DASHBOARD", "1") != "0"
+WEB_DASHBOARD_HOST = _ENV.get("WALTER_WEB_HOST", "localhost")
+try:
+    WEB_DASHBOARD_PORT = int(_ENV.get("WALTER_WEB_PORT", "8765"))
+except ValueError:
+    WEB_DASHBOARD_PORT = 8765
+
+
+@dataclass(frozen=True)
+class Config:
+    """Typed scheduler settings, parsed once from the constants above."""
+
+    interval: int
+    coin: str
+    hyperliquid_url: str
+    llm_model: str
+    history_length: int
+    llm_structured_output: bool
+    total_session_hours: int
+    api_wallet_private_key: str | None
+    general_public_key: str | None
+    openrouter_api_key: str | None
+    log_level: str
+    web_dashboard_enabled: bool
+    web_dashboard_host: str
+    web_dashboard_port: int
+
+    @property
+    def total_cycles(self) -> int:
+        return (self.total_session_hours * 3600) // self.interval
+
+
+@functools.lru_cache(maxsize=1)
+def load_config() -> Config:
+    return Config(
+        interval=int(SCHEDULER_INTERVAL_SECONDS),
+        coin=str(COIN),
+        hyperliquid_url=str(HYPERLIQUID_URL),
+        llm_model=str(LLM_MODEL),
+        history_length=int(LLM_HISTORY_LENGTH),
+        llm_structured_output=LLM_STRUCTURED_OUTPUT,
+        total_session_hours=int(TOTAL_SESSION_HOURS),
+        api_wallet_private_key=API_WALLET_PRIVATE_KEY,
+        general_public_key=GENERAL_PUBLIC_KEY,
+        openrouter_api_key=OPENROUTER_API_KEY,
+        log_level=LOG_LEVEL,
+        web_dashboard_enabled=WEB_DASHBOARD_ENABLED,
+        web_dashboard_host=WEB_DASHBOARD_HOST,
+        web_dashboard_port=WEB_DASHBOARD_PORT,
+    )
+
+
+CFG = load_config()
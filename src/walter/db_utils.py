@@ -1,8 +1,12 @@
-import json
 import logging
 import sqlite3
 import threading
-from typing import Any, Mapping
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from typing import Any
+
+import orjson
+
 from walter.config import SQLITE_DB_PATH
 
 logger = logging.getLogger(__name__)
@@ -17,11 +21,30 @@ def _get_conn() -> sqlite3.Connection:
         conn = sqlite3.connect(SQLITE_DB_PATH)
         conn.row_factory = sqlite3.Row
         conn.execute("PRAGMA journal_mode=WAL;")
+        # WAL only needs an fsync at checkpoints to stay consistent.
+        conn.execute("PRAGMA synchronous=NORMAL;")
         conn.execute("PRAGMA foreign_keys=ON;")
         _local.conn = conn
     return conn
 
 
+@contextmanager
+def transaction() -> Iterator[sqlite3.Connection]:
+    """Group several writes into one commit.
+
+    Pass the yielded connection as ``conn=`` to the ``save_*`` helpers; they
+    skip their own commit and the block commits once on exit (or rolls back
+    on error).
+    """
+    conn = _get_conn()
+    try:
+        yield conn
+    except Exception:
+        conn.rollback()
+        raise
+    conn.commit()
+
+
 def initialize_database() -> None:
     try:
         ddl = """
@@ -84,47 +107,87 @@ def initialize_database() -> None:
 
         CREATE INDEX IF NOT EXISTS idx_order_attempts_coin_time ON order_attempts (coin, created_at DESC);
 
+        CREATE INDEX IF NOT EXISTS idx_order_attempts_created_at ON order_attempts (created_at DESC);
+
         CREATE INDEX IF NOT EXISTS idx_order_attempts_snapshot_id ON order_attempts (market_snapshot_id);
         """
 
         conn = _get_conn()
+        # executescript runs in autocommit mode; nothing is left to commit.
         conn.executescript(ddl)
-        conn.commit()
     except Exception as e:
         logger.critical("A database error occurred: %s", e)
         logger.critical("Exiting gracefully")
         exit(1)
 
 
-def _sanitize_for_json(obj: Any) -> Any:
-    """Recursively replace NaN with None for JSON serialization."""
-    if isinstance(obj, float):
-        return None if obj != obj else obj  # obj != obj covers NaN
-    if isinstance(obj, dict):
-        return {k: _sanitize_for_json(v) for k, v in obj.items()}
-    if isinstance(obj, list):
-        return [_sanitize_for_json(v) for v in obj]
-    if isinstance(obj, tuple):
-        return tuple(_sanitize_for_json(v) for v in obj)
-    return obj
+def _execute_insert(
+    sql: str, params: Mapping[str, Any], conn: sqlite3.Connection | None
+) -> int:
+    """Run an INSERT; commit immediately unless part of a caller's transaction."""
+    if conn is not None:
+        return conn.execute(sql, params).lastrowid
+    conn = _get_conn()
+    cur = conn.execute(sql, params)
+    conn.commit()
+    return cur.lastrowid
+
+
+# INSERT statements, kept at module scope for readability only; sqlite3's
+# statement cache is keyed by SQL text, so inline literals were reused too.
+_INSERT_MARKET_SNAPSHOT_SQL = """
+INSERT INTO market_snapshots (
+    captured_at,
+    coin, current_price, ema10, ema20, funding_rate_latest,
+    funding_rate_avg, volatility_24h, volume_24h,
+    open_interest, buy_pressure, net_volume, raw_snapshot
+) VALUES (:captured_at,:coin, :current_price, :ema10, :ema20, :funding_rate_latest,
+          :funding_rate_avg, :volatility_24h, :volume_24h,
+          :open_interest, :buy_pressure, :net_volume, :raw_snapshot);
+"""
+
+_INSERT_ORDER_ATTEMPT_SQL = """
+INSERT INTO order_attempts (
+    created_at,
+    coin, is_buy, size, leverage, tif,
+    decision_action, thinking,
+    market_snapshot_id, account_snapshot_id, news_snapshot_id, order_payload, order_placed
+) VALUES (:created_at,:coin, :is_buy, :size, :leverage, :tif,
+          :decision_action, :thinking,
+          :market_snapshot_id, :account_snapshot_id, :news_snapshot_id, :order_payload, :order_placed);
+"""
+
+_INSERT_ACCOUNT_SNAPSHOT_SQL = """
+INSERT INTO account_snapshots (
+    captured_at, account_value, total_ntl_pos,
+    total_raw_usd, total_margin_used, withdrawable, raw_snapshot
+) VALUES (
+    :captured_at, :account_value, :total_ntl_pos,
+    :total_raw_usd, :total_margin_used, :withdrawable, :raw_snapshot
+);
+"""
+
+_INSERT_NEWS_SNAPSHOT_SQL = """
+INSERT INTO news_summaries (captured_at, summary) VALUES (:captured_at, :summary);
+"""
 
 
-def save_market_snapshot(snapshot: Mapping[str, Any], captured_at) -> int:
-    data = dict(snapshot)
+# orjson writes NaN/Infinity as null and handles NumPy scalars, so snapshot
+# values need no pre-sanitising; anything else unknown falls back to str().
+_JSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
 
-    # Sanitize data for JSON
-    sanitized_data = _sanitize_for_json(data)
 
-    sql = """
-    INSERT INTO market_snapshots (
+def _dumps(obj: Any) -> str:
+    """Serialize *obj* to a JSON string for a TEXT column."""
+    return orjson.dumps(obj, default=str, option=_JSON_OPTIONS).decode()
+
+
+def save_market_snapshot(
+    snapshot: Mapping[str, Any],
     captured_at,
-        coin, current_price, ema10, ema20, funding_rate_latest,
-        funding_rate_avg, volatility_24h, volume_24h,
-        open_interest, buy_pressure, net_volume, raw_snapshot
-    ) VALUES (:captured_at,:coin, :current_price, :ema10, :ema20, :funding_rate_latest,
-              :funding_rate_avg, :volatility_24h, :volume_24h,
-              :open_interest, :buy_pressure, :net_volume, :raw_snapshot);
-    """
+    conn: sqlite3.Connection | None = None,
+) -> int:
+    data = dict(snapshot)
     params = {
         "captured_at": str(captured_at),
         "coin": data.get("coin"),
@@ -138,12 +201,9 @@ def save_market_snapshot(snapshot: Mapping[str, Any], captured_at) -> int:
         "open_interest": data.get("open_interest"),
         "buy_pressure": data.get("buy_pressure"),
         "net_volume": data.get("net_volume"),
-        "raw_snapshot": json.dumps(sanitized_data),
+        "raw_snapshot": _dumps(data),
     }
-    conn = _get_conn()
-    cur = conn.execute(sql, params)
-    conn.commit()
-    return cur.lastrowid
+    return _execute_insert(_INSERT_MARKET_SNAPSHOT_SQL, params, conn)
 
 
 def save_order_attempt(
@@ -161,19 +221,8 @@ def save_order_attempt(
     news_snapshot_id: int | None = None,
     order_payload: Mapping[str, Any] | None,  # Updated type hint
     order_placed: Any | None = None,
+    conn: sqlite3.Connection | None = None,
 ) -> int:
-    sanitized_payload = _sanitize_for_json(order_payload) if order_payload else None
-
-    sql = """
-    INSERT INTO order_attempts (
-    created_at,
-        coin, is_buy, size, leverage, tif,
-        decision_action, thinking,
-        market_snapshot_id, account_snapshot_id, news_snapshot_id, order_payload, order_placed
-    ) VALUES (:created_at,:coin, :is_buy, :size, :leverage, :tif,
-              :decision_action, :thinking,
-              :market_snapshot_id, :account_snapshot_id, :news_snapshot_id, :order_payload, :order_placed);
-    """
     params = {
         "created_at": str(created_at),
         "coin": coin,
@@ -186,16 +235,17 @@ def save_order_attempt(
         "market_snapshot_id": market_snapshot_id,
         "account_snapshot_id": account_snapshot_id,
         "news_snapshot_id": news_snapshot_id,
-        "order_payload": json.dumps(sanitized_payload) if sanitized_payload else None,
+        "order_payload": _dumps(order_payload) if order_payload else None,
         "order_placed": int(order_placed) if order_placed is not None else None,
     }
-    conn = _get_conn()
-    cur = conn.execute(sql, params)
-    conn.commit()
-    return cur.lastrowid
+    return _execute_insert(_INSERT_ORDER_ATTEMPT_SQL, params, conn)
 
 
-def save_account_snapshot(captured_at, snapshot: Mapping[str, Any]) -> int:
+def save_account_snapshot(
+    captured_at,
+    snapshot: Mapping[str, Any],
+    conn: sqlite3.Connection | None = None,
+) -> int:
 
     # Extract fields from marginSummary
     margin_summary = snapshot.get("marginSummary", {})
@@ -205,17 +255,6 @@ def save_account_snapshot(captured_at, snapshot: Mapping[str, Any]) -> int:
     total_margin_used = margin_summary.get("totalMarginUsed")
     withdrawable = snapshot.get("withdrawable")
 
-    sanitized_snapshot = _sanitize_for_json(snapshot)
-
-    sql = """
-    INSERT INTO account_snapshots (
-        captured_at, account_value, total_ntl_pos,
-        total_raw_usd, total_margin_used, withdrawable, raw_snapshot
-    ) VALUES (
-        :captured_at, :account_value, :total_ntl_pos,
-        :total_raw_usd, :total_margin_used, :withdrawable, :raw_snapshot
-    );
-    """
     params = {
         "captured_at": str(captured_at),
         "account_value": account_value,
@@ -223,13 +262,10 @@ def save_account_snapshot(captured_at, snapshot: Mapping[str, Any]) -> int:
         "total_raw_usd": total_raw_usd,
         "total_margin_used": total_margin_used,
         "withdrawable": withdrawable,
-        "raw_snapshot": json.dumps(sanitized_snapshot),
+        "raw_snapshot": _dumps(snapshot),
     }
 
-    conn = _get_conn()
-    cur = conn.execute(sql, params)
-    conn.commit()
-    return cur.lastrowid
+    return _execute_insert(_INSERT_ACCOUNT_SNAPSHOT_SQL, params, conn)
 
 
 def get_recent_decisions(limit: int = 10) -> list[dict]:
@@ -255,12 +291,16 @@ def get_recent_decisions(limit: int = 10) -> list[dict]:
     return list(reversed(rows))
 
 
-def save_news_snapshot(summary: Mapping[str, Any], captured_at) -> int:
-    sql = """
-    INSERT INTO news_summaries (captured_at, summary) VALUES (:captured_at, :summary);
-    """
-    params = {"summary": json.dumps(summary), "captured_at": str(captured_at)}
-    conn = _get_conn()
-    cur = conn.execute(sql, params)
-    conn.commit()
-    return cur.lastrowid
+def get_latest_decision_id() -> int | None:
+    """Id of the newest order attempt; changes whenever a decision is saved."""
+    row = _get_conn().execute("SELECT max(id) FROM order_attempts;").fetchone()
+    return row[0]
+
+
+def save_news_snapshot(
+    summary: Mapping[str, Any],
+    captured_at,
+    conn: sqlite3.Connection | None = None,
+) -> int:
+    params = {"summary": _dumps(summary), "captured_at": str(captured_at)}
+    return _execute_insert(_INSERT_NEWS_SNAPSHOT_SQL, params, conn)
@@ -0,0 +1,150 @@
+import hashlib
+import logging
+import queue
+import threading
+from collections.abc import Callable, Mapping
+from typing import Any
+
+import orjson
+
+from walter.db_utils import (
+    save_account_snapshot,
+    save_market_snapshot,
+    save_news_snapshot,
+    save_order_attempt,
+    transaction,
+)
+
+logger = logging.getLogger(__name__)
+
+_queue: queue.SimpleQueue = queue.SimpleQueue()
+_pending = 0
+_pending_cond = threading.Condition()
+_worker: threading.Thread | None = None
+_worker_lock = threading.Lock()
+
+# kind -> (payload digest, row id) of the last committed snapshot, so an
+# unchanged payload reuses the previous row instead of inserting a copy.
+# Market snapshots carry a live price and are always inserted.
+_last_snapshots: dict[str, tuple[bytes, int]] = {}
+
+# Top-level keys that change on every fetch without the state changing
+# (clearinghouseState stamps each response with the server ``time``).
+_VOLATILE_KEYS = {"account": frozenset({"time"})}
+
+_HASH_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _digest(kind: str, payload: Any) -> bytes:
+    volatile = _VOLATILE_KEYS.get(kind)
+    if volatile and isinstance(payload, Mapping):
+        payload = {k: v for k, v in payload.items() if k not in volatile}
+    data = orjson.dumps(payload, option=_HASH_OPTIONS, default=str)
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _save_if_changed(
+    kind: str,
+    payload: Any,
+    seen: dict[str, tuple[bytes, int]],
+    save: Callable[[], int],
+) -> int:
+    digest = _digest(kind, payload)
+    previous = seen.get(kind)
+    if previous is not None and previous[0] == digest:
+        return previous[1]
+    row_id = save()
+    seen[kind] = (digest, row_id)
+    return row_id
+
+
+def _write_record(
+    record: Mapping[str, Any], conn, seen: dict[str, tuple[bytes, int]]
+) -> None:
+    """Insert one cycle's snapshots and link them from its order attempt.
+
+    Account and news snapshots identical to the previous one (ignoring
+    volatile keys) are not re-inserted; the order attempt links to the
+    earlier row instead.
+    """
+    captured_at = record["captured_at"]
+    account_snapshot_id = _save_if_changed(
+        "account",
+        record["account"],
+        seen,
+        lambda: save_account_snapshot(captured_at, record["account"], conn=conn),
+    )
+    market_snapshot_id = save_market_snapshot(
+        record["market"], captured_at=captured_at, conn=conn
+    )
+    news_snapshot_id = _save_if_changed(
+        "news",
+        record["news"],
+        seen,
+        lambda: save_news_snapshot(
+            record["news"], captured_at=captured_at, conn=conn
+        ),
+    )
+    save_order_attempt(
+        created_at=captured_at,
+        market_snapshot_id=market_snapshot_id,
+        account_snapshot_id=account_snapshot_id,
+        news_snapshot_id=news_snapshot_id,
+        conn=conn,
+        **record["order"],
+    )
+
+
+def _run() -> None:
+    global _pending
+    while True:
+        batch = [_queue.get()]
+        while True:
+            try:
+                batch.append(_queue.get_nowait())
+            except queue.Empty:
+                break
+
+        # Only remember snapshot ids once their transaction has committed.
+        seen = dict(_last_snapshots)
+        try:
+            with transaction() as conn:
+                for record in batch:
+                    _write_record(record, conn, seen)
+            _last_snapshots.update(seen)
+        except Exception:
+            logger.exception("Failed to persist %d cycle record(s)", len(batch))
+        finally:
+            with _pending_cond:
+                _pending -= len(batch)
+                _pending_cond.notify_all()
+
+
+def _ensure_worker() -> None:
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(
+                target=_run, name="walter-db-writer", daemon=True
+            )
+            _worker.start()
+
+
+def enqueue(record: Mapping[str, Any]) -> None:
+    """Queue a cycle record for persistence on the background writer thread.
+
+    ``record`` holds ``captured_at``, the ``market``/``account`` snapshots, the
+    ``news`` titles and the ``order`` attempt fields (``save_order_attempt``
+    keyword arguments, minus the snapshot ids).
+    """
+    global _pending
+    _ensure_worker()
+    with _pending_cond:
+        _pending += 1
+    _queue.put(record)
+
+
+def flush(timeout: float = 5.0) -> bool:
+    """Wait until queued records are written; returns False on timeout."""
+    with _pending_cond:
+        return _pending_cond.wait_for(lambda: _pending == 0, timeout)
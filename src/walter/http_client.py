@@ -0,0 +1,16 @@
+import requests
+from requests.adapters import HTTPAdapter
+
+# One keep-alive session for every Hyperliquid REST call (info requests, market
+# data and the SDK clients) so they share a single connection pool.
+SESSION = requests.Session()
+SESSION.headers.update({"Content-Type": "application/json"})
+# Room for the concurrent snapshot/account requests of a cycle to each keep
+# their own connection alive instead of discarding overflow connections.
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+
+def share_session(*clients) -> None:
+    """Point Hyperliquid SDK clients (``Info``/``Exchange``) at ``SESSION``."""
+    for client in clients:
+        client.session = SESSION
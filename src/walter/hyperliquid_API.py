@@ -1,13 +1,20 @@
+import functools
 import logging
 from decimal import Decimal
 from hyperliquid.exchange import Exchange
 from hyperliquid.info import Info
 from eth_account import Account
-import requests
-import json
+import orjson
+
+from walter.cache import TTLCache
+from walter.http_client import SESSION, share_session
 
 logger = logging.getLogger(__name__)
 
+# Universe metadata changes on the order of hours, so cache it per coin.
+_ASSET_META_TTL_SECONDS = 3600
+_asset_meta_cache = TTLCache(maxsize=32, ttl=_ASSET_META_TTL_SECONDS)
+
 
 def _get_tick_size(asset_meta: dict) -> Decimal:
     raw_tick = asset_meta.get("szDecimals")
@@ -44,15 +51,58 @@ def _snap_to_tick(
     )
 
 
+@functools.lru_cache(maxsize=4)
+def _get_clients(
+    base_url: str, api_wallet_private_key: str
+) -> tuple[Account, Info, Exchange]:
+    """Build (and cache) the signing account and SDK clients for *base_url*.
+
+    Key derivation and SDK setup (which fetches metadata) only run once per
+    ``(base_url, key)`` pair; call ``clear_client_cache`` after rotating keys.
+    """
+    account = Account.from_key(api_wallet_private_key)
+    exchange_url = base_url.removesuffix("/info")
+
+    info = Info(exchange_url, skip_ws=True, spot_meta={"universe": [], "tokens": []})
+    exchange = Exchange(account, exchange_url, spot_meta={"universe": [], "tokens": []})
+    share_session(info, exchange, exchange.info)
+    return account, info, exchange
+
+
+def clear_client_cache() -> None:
+    """Drop cached SDK clients, e.g. after the API wallet key changes."""
+    _get_clients.cache_clear()
+
+
+def _get_asset_meta(info: Info, coin: str) -> tuple[dict, int, Decimal] | None:
+    """Return ``(asset, size_decimals, tick_size)`` for *coin*, or None if unknown.
+
+    Results are cached for ``_ASSET_META_TTL_SECONDS`` so steady-state orders
+    skip the ``meta`` round-trip.
+    """
+    key = f"universe:{info.base_url}:{coin}"
+    cached = _asset_meta_cache.get(key)
+    if cached is not None:
+        return cached
+
+    meta = info.meta()
+    asset = next((a for a in meta["universe"] if a["name"] == coin), None)
+    if not asset:
+        return None
+
+    cached = (asset, asset["szDecimals"], _get_tick_size(asset))
+    _asset_meta_cache.set(key, cached)
+    return cached
+
+
 def get_open_position_details(base_url: str, general_public_key: str) -> dict:
     """Fetch clearinghouse state for the given public key."""
-    payload = json.dumps(
+    payload = orjson.dumps(
         {"type": "clearinghouseState", "user": general_public_key, "dex": ""}
     )
-    headers = {"Content-Type": "application/json"}
 
-    response = requests.request("POST", base_url, headers=headers, data=payload)
-    return response.json()
+    response = SESSION.post(base_url, data=payload, timeout=10)
+    return orjson.loads(response.content)
 
 
 def get_withdrawable_balance(account_snapshot: dict) -> float | None:
@@ -90,23 +140,16 @@ def place_order(
     # =============================================================================
     # Setup
     # =============================================================================
-    account = Account.from_key(api_wallet_private_key)
-    base_url = base_url.removesuffix("/info")
-
-    info = Info(base_url, skip_ws=True, spot_meta={"universe": [], "tokens": []})
-    exchange = Exchange(account, base_url, spot_meta={"universe": [], "tokens": []})
+    _, info, exchange = _get_clients(base_url, api_wallet_private_key)
 
     # =============================================================================
     # Get asset metadata
     # =============================================================================
-    meta = info.meta()
-    asset = next((a for a in meta["universe"] if a["name"] == coin), None)
-    if not asset:
+    asset_meta = _get_asset_meta(info, coin)
+    if asset_meta is None:
         raise ValueError(f"Coin {coin} not found")
 
-    size_decimals = asset["szDecimals"]
-
-    tick_size = _get_tick_size(asset)
+    _, size_decimals, tick_size = asset_meta
 
     # Get live prices
     l2 = info.l2_snapshot(coin)
@@ -114,10 +157,6 @@ def place_order(
     ask = float(l2["levels"][1][0]["px"])
     mid = (bid + ask) / 2
 
-    logger.info("=" * 60)
-    logger.info("Asset: %s", coin)
-    logger.info(f"Bid: ${bid:,.2f}, Ask: ${ask:,.2f}, Mid: ${mid:,.2f}")
-
     # =============================================================================
     # Validate size
     # =============================================================================
@@ -131,27 +170,37 @@ def place_order(
         validated_price, note = _snap_to_tick(
             raw_price, tick_size, bias="up" if is_buy else "down"
         )
-        if note:
-            logger.info(note)
         order_type_payload = {"market": {}}
     else:
         raw_price = PRICE
         validated_price, note = _snap_to_tick(raw_price, tick_size)
         if note:
-            logger.info("Limit price adjustment needed -> %s", note)
+            note = f"Limit price adjustment needed -> {note}"
         order_type_payload = {"limit": {"tif": "Gtc"}}
 
     # =============================================================================
     # Display final order details
     # =============================================================================
-    logger.info("-" * 60)
-    logger.info("Final Order Details:")
-    logger.info("  Coin:      %s", coin)
-    logger.info("  Type:      %s", ORDER_TYPE.upper())
-    logger.info("  Direction: %s", "BUY" if is_buy else "SELL")
-    logger.info("  Size:      %s %s", validated_size, coin)
-    logger.info(f"  Price:     ${validated_price:,.2f}")
-    logger.info(f"  Total:     ${validated_size * float(validated_price.real):,.2f}")
+    # Emitted as a single record so the banner costs one handler call.
+    if logger.isEnabledFor(logging.INFO):
+        lines = [
+            "=" * 60,
+            f"Asset: {coin}",
+            f"Bid: ${bid:,.2f}, Ask: ${ask:,.2f}, Mid: ${mid:,.2f}",
+        ]
+        if note:
+            lines.append(note)
+        lines += [
+            "-" * 60,
+            "Final Order Details:",
+            f"  Coin:      {coin}",
+            f"  Type:      {ORDER_TYPE.upper()}",
+            f"  Direction: {'BUY' if is_buy else 'SELL'}",
+            f"  Size:      {validated_size} {coin}",
+            f"  Price:     ${validated_price:,.2f}",
+            f"  Total:     ${validated_size * float(validated_price.real):,.2f}",
+        ]
+        logger.info("\n".join(lines))
 
     # =============================================================================
     # Place order
@@ -166,9 +215,8 @@ def place_order(
             {"limit": {"tif": tif}},
             reduce_only=False,
         )
-        logger.info("Leverage update: %s", lev)
-        logger.info("✅ Order placed successfully!")
-        logger.info("Result: %s", result)
+        logger.debug("Leverage update: %s", lev)
+        logger.info("✅ Order placed successfully! Result: %s", result)
         return True
     except Exception as e:
         logger.error("❌ Error placing order: %s", e)
@@ -210,19 +258,15 @@ def close_position(
     close_size = abs(szi)
 
     # 2. Setup exchange connection
-    acct = Account.from_key(api_wallet_private_key)
-    exchange_base = base_url.removesuffix("/info")
-    info = Info(exchange_base, skip_ws=True, spot_meta={"universe": [], "tokens": []})
-    exchange = Exchange(acct, exchange_base, spot_meta={"universe": [], "tokens": []})
+    _, info, exchange = _get_clients(base_url, api_wallet_private_key)
 
     # 3. Get asset metadata for size rounding
-    meta = info.meta()
-    asset = next((a for a in meta["universe"] if a["name"] == coin), None)
-    if not asset:
+    asset_meta = _get_asset_meta(info, coin)
+    if asset_meta is None:
         logger.error("Coin %s not found in universe; cannot close.", coin)
         return False
 
-    size_decimals = asset["szDecimals"]
+    _, size_decimals, tick_size = asset_meta
     validated_size = round(close_size, size_decimals)
 
     # 4. Price — use aggressive slippage to guarantee fill
@@ -231,16 +275,14 @@ def close_position(
     ask = float(l2["levels"][1][0]["px"])
     raw_price = ask * 1.02 if is_buy else bid * 0.98
 
-    tick_size = _get_tick_size(asset)
     validated_price, note = _snap_to_tick(
         raw_price, tick_size, bias="up" if is_buy else "down"
     )
     if note:
         logger.info(note)
 
-    logger.info("-" * 60)
-    logger.info("Closing %s position: %s %.6f @ ~$%.2f",
-                coin, "BUY-to-close" if is_buy else "SELL-to-close",
+    logger.info("%s\nClosing %s position: %s %.6f @ ~$%.2f",
+                "-" * 60, coin, "BUY-to-close" if is_buy else "SELL-to-close",
                 validated_size, validated_price)
 
     try:
@@ -1,20 +1,89 @@
+import asyncio
+import functools
 import logging
-import requests
+import orjson
 import numpy as np
-import pandas as pd
-from datetime import datetime, timezone
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List
 
+from walter.cache import TTLCache
+from walter.http_client import SESSION
+
 logger = logging.getLogger(__name__)
 
+# How long each info response stays fresh, by request type (seconds). Prices
+# and trades are effectively uncached; slower-moving data is shared across
+# coins and back-to-back snapshots. Every TTL is well below
+# SCHEDULER_INTERVAL_SECONDS, so the cache only helps repeated calls within a
+# cycle (several coins, batch snapshots) or much shorter intervals; it never
+# serves one scheduler cycle's data to the next.
+_POST_TTL_SECONDS = {
+    "allMids": 1,
+    "candleSnapshot": 60,
+    "fundingHistory": 60,
+    "metaAndAssetCtxs": 30,
+    "recentTrades": 1,
+}
+_post_cache = TTLCache(maxsize=64, ttl=1)
+
 
 def _post(
-    base_url: str, payload: Dict[str, Any]
+    base_url: str,
+    payload: Dict[str, Any],
+    key_payload: Dict[str, Any] | None = None,
 ) -> Dict[str, Any] | List[Dict[str, Any]]:
-    """Send a POST request to the given base URL."""
-    response = requests.post(base_url, json=payload, timeout=10)
+    """Send a POST request to the given base URL, reusing fresh cached replies.
+
+    ``key_payload`` replaces *payload* in the cache key, e.g. to bucket a
+    time window without changing what is sent.
+    """
+    body = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+    key_body = (
+        body
+        if key_payload is None
+        else orjson.dumps(key_payload, option=orjson.OPT_SORT_KEYS)
+    )
+    key = (base_url, key_body)
+    cached = _post_cache.get(key)
+    if cached is not None:
+        return cached
+
+    # The encoded payload doubles as the request body; SESSION sets the
+    # JSON Content-Type header.
+    response = SESSION.post(base_url, data=body, timeout=10)
     response.raise_for_status()
-    return response.json()
+    result = orjson.loads(response.content)
+    _post_cache.set(key, result, ttl=_POST_TTL_SECONDS.get(payload["type"]))
+    return result
+
+
+def get_market_cache_stats() -> dict[str, int]:
+    """Hit/miss counters for the Hyperliquid info response cache."""
+    return _post_cache.stats
+
+
+@functools.lru_cache(maxsize=8)
+def _ema_weights(n: int) -> np.ndarray:
+    """Normalised EMA10/EMA20 weights (pandas adjust=True) for *n* closes."""
+    exponents = np.arange(n - 1, -1, -1, dtype=np.float64)
+    weights = np.vstack([(1.0 - 2.0 / (span + 1)) ** exponents for span in (10, 20)])
+    weights /= weights.sum(axis=1, keepdims=True)
+    weights.flags.writeable = False  # shared via the cache
+    return weights
+
+
+def _candle_features(closes: np.ndarray) -> tuple[float, float, float]:
+    """EMA10, EMA20 and return volatility of *closes*.
+
+    Both EMAs come from one matrix product with cached weights; volatility is
+    the sample (ddof=1) std of candle-to-candle returns, as pandas'
+    ``pct_change().std()``.
+    """
+    ema10, ema20 = _ema_weights(len(closes)) @ closes
+    returns = closes[1:] / closes[:-1] - 1.0
+    volatility = float(returns.std(ddof=1)) if len(returns) > 1 else float("nan")
+    return float(ema10), float(ema20), volatility
 
 
 def _get_hyperliquid_interval(interval_seconds: int) -> tuple[str, int]:
@@ -46,51 +115,100 @@ def get_market_snapshot(
     Collect a quick market overview for the requested coin.
 
     Returns a dictionary with price, volume, funding and trade information.
+    Synchronous wrapper around ``get_market_snapshot_async``; when called
+    from a thread with a running event loop (where ``asyncio.run`` would
+    raise), the snapshot is built on a worker thread's own loop instead.
+    Async callers should await ``get_market_snapshot_async`` directly.
+    """
+
+    def run() -> Dict[str, Any]:
+        return asyncio.run(
+            get_market_snapshot_async(coin, interval_seconds, base_url, target_candles)
+        )
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return run()
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(run).result()
+
+
+def _candle_payload(
+    coin: str, interval_str: str, start_time: int, end_time: int
+) -> Dict[str, Any]:
+    return {
+        "type": "candleSnapshot",
+        "req": {
+            "coin": coin,
+            "interval": interval_str,
+            "startTime": start_time,
+            "endTime": end_time,
+        },
+    }
+
+
+async def get_market_snapshot_async(
+    coin: str, interval_seconds: int, base_url: str, target_candles: int = 24
+) -> Dict[str, Any]:
+    """
+    Collect a quick market overview for the requested coin.
+
+    The five info requests are independent, so they are issued concurrently
+    (each in a worker thread) and the snapshot is built once all return.
     """
     interval_str, duration_ms = _get_hyperliquid_interval(interval_seconds)
-    end_time = int(datetime.now(timezone.utc).timestamp() * 1000)
+    end_time = time.time_ns() // 1_000_000
     start_time = end_time - (target_candles * duration_ms)
+    # Only the cache key is bucketed to the candle boundary, so repeat calls
+    # within one candle share an entry; the request keeps the live window.
+    bucket_end = end_time - end_time % duration_ms
+    bucket_start = bucket_end - (target_candles * duration_ms)
+
+    calls = (
+        ({"type": "allMids"}, None),
+        (
+            _candle_payload(coin, interval_str, start_time, end_time),
+            _candle_payload(coin, interval_str, bucket_start, bucket_end),
+        ),
+        (
+            {"type": "fundingHistory", "coin": coin, "startTime": start_time},
+            {"type": "fundingHistory", "coin": coin, "startTime": bucket_start},
+        ),
+        ({"type": "metaAndAssetCtxs", "coin": coin}, None),
+        ({"type": "recentTrades", "coin": coin}, None),
+    )
+    mids, candles, funding, oi_resp, trades = await asyncio.gather(
+        *(
+            asyncio.to_thread(_post, base_url, payload, key_payload)
+            for payload, key_payload in calls
+        )
+    )
 
     # ------------------------------------------------
     # 1. Current price
     # ------------------------------------------------
-    mids = _post(base_url, {"type": "allMids"})
     current_price = float(mids.get(coin, 0))
 
     # ------------------------------------------------
     # 2. Candle data
     # ------------------------------------------------
-    candles = _post(
-        base_url,
-        {
-            "type": "candleSnapshot",
-            "req": {
-                "coin": coin,
-                "interval": interval_str,
-                "startTime": start_time,
-                "endTime": end_time,
-            },
-        },
+    recent = candles[-target_candles:]
+    closes = np.fromiter(
+        (float(c["c"]) for c in recent), dtype=np.float64, count=len(recent)
+    )
+    if not len(closes):
+        return {"error": f"No candles returned for '{coin}'"}
+    volumes = np.fromiter(
+        (float(c["v"]) for c in recent), dtype=np.float64, count=len(recent)
     )
 
-    df = pd.DataFrame(candles)
-    df["t"] = pd.to_datetime(df["t"], unit="ms")
-    df["c"] = df["c"].astype(float)
-    df["v"] = df["v"].astype(float)
-
-    # Target subset based on target_candles
-    recent = df.tail(target_candles)
-    ema10 = recent["c"].ewm(span=10).mean().iloc[-1]
-    ema20 = recent["c"].ewm(span=20).mean().iloc[-1]
-    volatility = recent["c"].pct_change().std()
-    vol24h = recent["v"].sum()
+    ema10, ema20, volatility = _candle_features(closes)
+    vol24h = float(volumes.sum())
 
     # ------------------------------------------------
     # 3. Funding history
     # ------------------------------------------------
-    funding = _post(
-        base_url, {"type": "fundingHistory", "coin": coin, "startTime": start_time}
-    )
     rates = [float(x["fundingRate"]) for x in funding]
     funding_latest = rates[-1] if rates else None
     funding_avg = float(np.mean(rates)) if rates else None
@@ -98,16 +216,13 @@ def get_market_snapshot(
     # ------------------------------------------------
     # 4. Open interest
     # ------------------------------------------------
-    oi_resp = _post(base_url, {"type": "metaAndAssetCtxs", "coin": coin})
     universe = oi_resp[0]["universe"]
     asset_contexts = oi_resp[1]
 
     # Find the index of the coin
-    coin_index = None
-    for idx, asset in enumerate(universe):
-        if asset["name"] == coin:
-            coin_index = idx
-            break
+    coin_index = next(
+        (idx for idx, asset in enumerate(universe) if asset["name"] == coin), None
+    )
 
     if coin_index is None:
         return {"error": f"Coin '{coin}' not found"}
@@ -115,12 +230,13 @@ def get_market_snapshot(
     # Get the corresponding asset context
     asset_ctx = asset_contexts[coin_index]
 
-    open_interest = asset_ctx.get("openInterest")
+    # Hyperliquid reports numbers as strings; store a float like the other fields.
+    raw_open_interest = asset_ctx.get("openInterest")
+    open_interest = float(raw_open_interest) if raw_open_interest is not None else None
 
     # ------------------------------------------------
     # 5. Recent trades
     # ------------------------------------------------
-    trades = _post(base_url, {"type": "recentTrades", "coin": coin})
     buy_volume = 0
     sell_volume = 0
     for trade in trades:
@@ -160,3 +276,21 @@ def get_market_snapshot(
         "net_volume": net_volume,
     }
     return snapshot
+
+
+async def get_market_snapshots_batch(
+    coins: List[str], interval_seconds: int, base_url: str, target_candles: int = 24
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Collect market snapshots for several coins concurrently.
+
+    Hyperliquid's candle endpoint is single-symbol, so each coin gets its own
+    concurrent snapshot. Returns a dictionary keyed by coin.
+    """
+    snapshots = await asyncio.gather(
+        *(
+            get_market_snapshot_async(coin, interval_seconds, base_url, target_candles)
+            for coin in coins
+        )
+    )
+    return dict(zip(coins, snapshots))
@@ -1,8 +1,11 @@
 import logging
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from typing import List, Dict, Optional
 from datetime import datetime
 
+from walter.cache import TTLCache
 from walter.config import (
     CP_URL,
     CP_CRYPTOPANIC_KEY,
@@ -13,27 +16,59 @@ from walter.config import (
     CC_CATEGORIES,
     CC_LANG,
     CC_LIMIT,
+    CC_CRYPTOCOMPARE_KEY,
+    NEWS_RESPONSE_TTL,
 )
 
 logger = logging.getLogger(__name__)
 
+# Shared by every news client so keep-alive connections (and their TLS
+# sessions) survive across aggregation cycles. Per-source headers are passed
+# per request rather than set on the session.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+# Decoded responses keyed on (url, params, headers). Upstream feeds change on
+# a scale of minutes, so repeat fetches within the TTL skip HTTP and parsing.
+_response_cache = TTLCache(maxsize=8, ttl=NEWS_RESPONSE_TTL)
+
 
 class CryptoNewsAPI:
     """Base class for crypto news API clients."""
 
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key
-        self.session = requests.Session()
+        self.session = _SESSION
 
-    def _make_request(self, url: str, params: Optional[Dict] = None) -> Dict:
-        """Make HTTP GET request with error handling."""
+    def _make_request(
+        self,
+        url: str,
+        params: Optional[Dict] = None,
+        headers: Optional[Dict] = None,
+    ) -> Dict:
+        """Make HTTP GET request with error handling.
+
+        Successful responses are cached for ``NEWS_RESPONSE_TTL`` seconds.
+        """
+        key = (
+            url,
+            tuple(sorted((params or {}).items())),
+            tuple(sorted((headers or {}).items())),
+        )
+        cached = _response_cache.get(key)
+        if cached is not None:
+            return cached
         try:
-            response = self.session.get(url, params=params, timeout=10)
+            response = self.session.get(
+                url, params=params, headers=headers, timeout=10
+            )
             response.raise_for_status()
-            return response.json()
+            data = response.json()
         except requests.exceptions.RequestException as e:
             logger.error("Error fetching data: %s", e)
             return {}
+        _response_cache.set(key, data)
+        return data
 
 
 class CryptoPanicNews(CryptoNewsAPI):
@@ -60,12 +95,12 @@ class CryptoPanicNews(CryptoNewsAPI):
             data = self._make_request(self.BASE_URL, params)
             results = data.get("results", [])
 
-            articles = []
-            for article in results:
-                try:
-                    articles.append(self._format_article(article))
-                except Exception as e:
-                    logger.warning("[CryptoPanic] Skipping article: %s", e)
+            # Cheap shape check up front instead of a try/except per article.
+            articles = [
+                self._format_article(article)
+                for article in results
+                if isinstance(article, dict)
+            ]
             logger.info("[CryptoPanic] Fetched %d articles", len(articles))
             return articles
 
@@ -75,20 +110,20 @@ class CryptoPanicNews(CryptoNewsAPI):
 
     def _format_article(self, article: Dict) -> Dict:
         """Format CryptoPanic article data."""
-        try:
-            return {
-                "source": "CryptoPanic",
-                "title": article.get("title", ""),
-                "url": article.get("url", ""),
-                "published_at": article.get("published_at", ""),
-                "body": article.get("description") or "",
-                "domain": article.get("domain", ""),
-                "currencies": [c.get("code") for c in article.get("currencies", [])],
-                "votes": article.get("votes", {}),
-            }
-        except Exception as e:
-            logger.warning("[CryptoPanic] Skipping article: %s", e)
-            return {}
+        return {
+            "source": "CryptoPanic",
+            "title": article.get("title", ""),
+            "url": article.get("url", ""),
+            "published_at": article.get("published_at", ""),
+            "body": article.get("description") or "",
+            "domain": article.get("domain", ""),
+            "currencies": [
+                c.get("code")
+                for c in article.get("currencies") or []
+                if isinstance(c, dict)
+            ],
+            "votes": article.get("votes", {}),
+        }
 
 
 class CryptoCompareNews(CryptoNewsAPI):
@@ -96,11 +131,11 @@ class CryptoCompareNews(CryptoNewsAPI):
 
     BASE_URL = CC_URL
 
-    def __init__(self):
-        super().__init__(api_key=None)
-        self.session.headers.update(
-            {"Content-type": "application/json; charset=UTF-8"}
-        )
+    def __init__(self, api_key: Optional[str] = None):
+        super().__init__(api_key)
+        self.headers = {"Content-type": "application/json; charset=UTF-8"}
+        if api_key:
+            self.headers["authorization"] = f"Apikey {api_key}"
 
     def get_news(
         self,
@@ -124,7 +159,7 @@ class CryptoCompareNews(CryptoNewsAPI):
             if categories:
                 params["categories"] = categories
 
-            data = self._make_request(self.BASE_URL, params)
+            data = self._make_request(self.BASE_URL, params, self.headers)
             results = data.get("Data", [])
             logger.info("[CryptoCompare] Fetched %d articles", len(results))
             return [self._format_article(article) for article in results]
@@ -162,8 +197,10 @@ class CryptoNewsAggregator:
     def __init__(
         self,
         cryptopanic_key: Optional[str] = None,
+        cryptocompare_key: Optional[str] = None,
     ):
         self.cryptopanic_key = cryptopanic_key
+        self.cryptocompare_key = cryptocompare_key
 
     def get_all_news(
         self,
@@ -188,28 +225,37 @@ class CryptoNewsAggregator:
         Returns:
             Combined list of news articles
         """
-        all_news = []
-
-        # Fetch from CryptoPanic
-        if self.cryptopanic_key:
-            logger.info("=== Fetching from CryptoPanic ===")
-            cp = CryptoPanicNews(self.cryptopanic_key)
-            cp_news = cp.get_news(
-                currencies=cp_currencies,
-                filter_type=cp_filter,
-                kind=cp_kind,
+        # The sources are unrelated hosts, so fetch them concurrently and wait
+        # for the slower one instead of both in turn.
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            futures = []
+            if self.cryptopanic_key:
+                logger.info("=== Fetching from CryptoPanic ===")
+                cp = CryptoPanicNews(self.cryptopanic_key)
+                futures.append(
+                    pool.submit(
+                        cp.get_news,
+                        currencies=cp_currencies,
+                        filter_type=cp_filter,
+                        kind=cp_kind,
+                    )
+                )
+
+            # CoinDesk / CryptoCompare (API key optional)
+            logger.info("=== Fetching from CoinDesk ===")
+            cc = CryptoCompareNews(self.cryptocompare_key)
+            futures.append(
+                pool.submit(
+                    cc.get_news,
+                    categories=cc_categories,
+                    lang=cc_lang,
+                    limit=cc_limit,
+                )
             )
-            all_news.extend(cp_news)
-
-        # Fetch from CoinDesk / CryptoCompare (no API key needed)
-        logger.info("=== Fetching from CoinDesk ===")
-        cc = CryptoCompareNews()
-        cc_news = cc.get_news(
-            categories=cc_categories,
-            lang=cc_lang,
-            limit=cc_limit,
-        )
-        all_news.extend(cc_news)
+
+            all_news = []
+            for future in futures:
+                all_news.extend(future.result())
 
         # Sort by published date (newest first)
         all_news.sort(key=lambda x: x.get("published_at", ""), reverse=True)
@@ -222,6 +268,7 @@ class CryptoNewsAggregator:
         logger.info("=== Aggregated News ===")
         aggregator = CryptoNewsAggregator(
             cryptopanic_key=CP_CRYPTOPANIC_KEY,
+            cryptocompare_key=CC_CRYPTOCOMPARE_KEY,
         )
         all_news = aggregator.get_all_news(
             cp_currencies=CP_CURRENCIES,
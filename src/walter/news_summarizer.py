@@ -1,98 +1,158 @@
+import hashlib
 import logging
 import re
 import html
-from collections import defaultdict
 
 import numpy as np
 from sklearn.cluster import DBSCAN
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 
-from walter.config import EPS
+from walter.cache import TTLCache
+from walter.config import EPS, NEWS_SUMMARY_TTL
 
 logger = logging.getLogger(__name__)
 
+_summary_cache = TTLCache(maxsize=4, ttl=NEWS_SUMMARY_TTL)
 
-def get_summaries_from_news(all_news: list[dict]) -> dict:
-    """Cluster news articles into major narratives and secondary signals."""
-    cleaned_texts = []
-    clickbait = ["heres", "could", "might", "skyrocket", "why", "what happened"]
-    try:
-        for n in all_news:
-            # We include the body because narratives are found in the details
-            text = f"{n.get('title', '')} {n.get('body', '')[:200]}".lower()
-            text = re.sub(r"[^a-z0-9\s]", " ", text)
-            text = html.unescape(text)
-            for word in clickbait:
-                text = text.replace(word, "")
-            cleaned_texts.append(re.sub(r"\s+", " ", text).strip())
-
-        if not cleaned_texts:
-            return {
-                "major_narratives": [],
-                "secondary_signals": [],
-            }
+# Smallest group DBSCAN treats as a narrative.
+_MIN_SAMPLES = 2
 
-        # Build TF-IDF vectors and cluster them by cosine distance.
-        vectorizer = TfidfVectorizer(
-            lowercase=False,
-            ngram_range=(1, 2),
-            min_df=1,
-            max_features=5000,
-        )
-        embeddings = vectorizer.fit_transform(cleaned_texts).toarray()
+# Byte table mapping everything except [a-z0-9] and ASCII whitespace to a
+# space; one translate pass replaces a [^a-z0-9\s] regex substitution.
+_KEEP_BYTES = frozenset(b"abcdefghijklmnopqrstuvwxyz0123456789 \t\n\r\x0b\x0c")
+_ALNUM_TABLE = bytes(b if b in _KEEP_BYTES else 0x20 for b in range(256))
+
+_WHITESPACE_RE = re.compile(r"\s+")
+# Clickbait filler words, removed in one pass before vectorizing.
+_CLICKBAIT_RE = re.compile(
+    r"\b(?:heres|could|might|skyrocket|why|what\s+happened)\b"
+)
 
-        # eps is the "Narrative Threshold"; it groups by general topic.
-        clustering = DBSCAN(eps=EPS, min_samples=2, metric="cosine")
-        labels = clustering.fit_predict(embeddings)
 
-        # Organize by narrative
-        narratives = defaultdict(list)
-        for i, lab in enumerate(labels):
-            narratives[lab].append(i)
+def _secondary_signal(all_news: list[dict], i: int) -> dict:
+    title = all_news[i].get("title", "") or "Untitled"
+    return {
+        "title": f"[Secondary Signal] {title} #{i}",
+        "body": all_news[i].get("body", ""),
+        "source_count": 1,
+    }
 
-        # Generate the summary
-        logger.info("=== SUMMARIZING MARKET NARRATIVES ===")
-        items = sorted(narratives.items(), key=lambda x: (x[0] == -1, -len(x[1])))
 
-        result = {
+def _summarize_news(all_news: list[dict]) -> dict:
+    """Cluster news articles into major narratives and secondary signals."""
+    if len(all_news) < _MIN_SAMPLES:
+        # Too few articles to form a narrative; skip vectorizing/clustering.
+        return {
             "major_narratives": [],
-            "secondary_signals": [],
+            "secondary_signals": [
+                _secondary_signal(all_news, i) for i in range(len(all_news))
+            ],
         }
 
-        for lab, idxs in items:
-            if lab == -1:
-                # Secondary signals: one per article
-                for i in idxs:
-                    title = all_news[i].get("title", "") or "Untitled"
-                    body = all_news[i].get("body", "")
-                    result["secondary_signals"].append(
-                        {
-                            "title": f"[Secondary Signal] {title} #{i}",
-                            "body": body,
-                            "source_count": 1,
-                        }
-                    )
-                continue
-
-            # Representative (most central) item in the cluster
-            sub_embeddings = embeddings[idxs]
-            sim_matrix = cosine_similarity(sub_embeddings, sub_embeddings)
-            best_local = int(np.argmax(sim_matrix.mean(axis=1)))
-            best_idx = int(idxs[best_local])
-
-            count = int(len(idxs))
-            lab_py = int(lab)  # ensure Python int (DBSCAN label)
-            title = all_news[best_idx].get("title", "") or "Untitled"
-            body = all_news[best_idx].get("body", "")
-
-            result["major_narratives"].append(
-                {
-                    "title": f"[{count} sources] {title} #{lab_py}",
-                    "body": body,
-                    "source_count": count,
-                }
+    cleaned_texts = []
+    for n in all_news:
+        # We include the body because narratives are found in the details
+        text = f"{n.get('title', '')} {n.get('body', '')[:200]}".lower()
+        text = html.unescape(text).encode().translate(_ALNUM_TABLE).decode("ascii")
+        text = _CLICKBAIT_RE.sub("", text)
+        cleaned_texts.append(_WHITESPACE_RE.sub(" ", text).strip())
+
+    # Build TF-IDF vectors and cluster them by cosine distance.
+    vectorizer = TfidfVectorizer(
+        lowercase=False,
+        ngram_range=(1, 2),
+        min_df=1,
+        max_features=5000,
+        # Single precision is ample for cosine clustering and halves the
+        # dense matrix handed to DBSCAN.
+        dtype=np.float32,
+    )
+    embeddings = vectorizer.fit_transform(cleaned_texts).toarray()
+
+    # Rows are L2-normalized, so cosine distance is 1 - E @ E.T: one GEMM
+    # instead of DBSCAN recomputing pairwise cosines. Clip rounding noise so
+    # the matrix stays a valid (non-negative) distance.
+    distances = 1.0 - embeddings @ embeddings.T
+    np.clip(distances, 0.0, None, out=distances)
+    np.fill_diagonal(distances, 0.0)
+
+    # eps is the "Narrative Threshold"; it groups by general topic.
+    clustering = DBSCAN(eps=EPS, min_samples=_MIN_SAMPLES, metric="precomputed")
+    labels = clustering.fit_predict(distances)
+
+    # Organize by narrative: a stable argsort makes each label's indices
+    # contiguous (and ascending), and groups keep first-occurrence order so
+    # equal-sized narratives rank as before.
+    order = np.argsort(labels, kind="stable")
+    uniq, starts, counts = np.unique(
+        labels[order], return_index=True, return_counts=True
+    )
+    narratives = {
+        int(uniq[k]): order[starts[k] : starts[k] + counts[k]].tolist()
+        for k in np.argsort(order[starts], kind="stable")
+    }
+
+    # Generate the summary
+    logger.info("=== SUMMARIZING MARKET NARRATIVES ===")
+    items = sorted(narratives.items(), key=lambda x: (x[0] == -1, -len(x[1])))
+
+    result = {
+        "major_narratives": [],
+        "secondary_signals": [],
+    }
+
+    for lab, idxs in items:
+        if lab == -1:
+            # Secondary signals: one per article
+            result["secondary_signals"].extend(
+                _secondary_signal(all_news, i) for i in idxs
             )
+            continue
+
+        # Representative (most central) item in the cluster. TF-IDF rows are
+        # L2-normalized, so each row's dot product with the cluster sum ranks
+        # items by mean cosine similarity without building the k x k matrix.
+        sub_embeddings = embeddings[idxs]
+        scores = sub_embeddings @ sub_embeddings.sum(axis=0)
+        best_local = int(np.argmax(scores))
+        best_idx = int(idxs[best_local])
+
+        count = int(len(idxs))
+        lab_py = int(lab)  # ensure Python int (DBSCAN label)
+        title = all_news[best_idx].get("title", "") or "Untitled"
+        body = all_news[best_idx].get("body", "")
+
+        result["major_narratives"].append(
+            {
+                "title": f"[{count} sources] {title} #{lab_py}",
+                "body": body,
+                "source_count": count,
+            }
+        )
+
+    return result
+
+
+def _news_digest(all_news: list[dict]) -> bytes:
+    """Stable digest of the article titles, used as the summary cache key."""
+    titles = [str(n.get("title", "")).encode("utf-8") for n in all_news]
+    return hashlib.blake2b(b"\x00".join(titles), digest_size=16).digest()
+
+
+def get_summaries_from_news(all_news: list[dict]) -> dict:
+    """Cluster news articles into major narratives and secondary signals.
+
+    Narratives move on a scale of minutes, so results are cached for
+    ``NEWS_SUMMARY_TTL`` seconds per distinct set of titles.
+    """
+    key = _news_digest(all_news)
+    cached = _summary_cache.get(key)
+    if cached is not None:
+        logger.info("News summary cache hit (%s)", _summary_cache.stats)
+        return cached
+
+    try:
+        result = _summarize_news(all_news)
     except Exception as e:
         logger.error(f"Error summarizing news: {e}")
         return {
@@ -100,4 +160,10 @@ def get_summaries_from_news(all_news: list[dict]) -> dict:
             "secondary_signals": [],
         }
 
+    _summary_cache.set(key, result)
     return result
+
+
+def get_summary_cache_stats() -> dict[str, int]:
+    """Return hit/miss counters for the news summary cache."""
+    return _summary_cache.stats
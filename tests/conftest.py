@@ -0,0 +1,6 @@
+import os
+import tempfile
+
+# walter.config reads SQLITE_DB_PATH at import time, so point it at a scratch
+# database before any test module imports walter.
+os.environ["SQLITE_DB_PATH"] = os.path.join(tempfile.mkdtemp(), "walter-test.db")
@@ -0,0 +1,74 @@
+from types import SimpleNamespace
+
+import pytest
+
+from walter import cache as cache_module
+from walter.cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(
+        cache_module, "time", SimpleNamespace(monotonic=lambda: now.value)
+    )
+    return now
+
+
+def test_entry_expires_after_ttl(clock):
+    cache = TTLCache(maxsize=4, ttl=10)
+    cache.set("k", "v")
+
+    clock.value += 9.9
+    assert cache.get("k") == "v"
+
+    clock.value += 0.1
+    assert cache.get("k") is None
+    assert cache.get("k", "default") == "default"
+    assert cache.stats == {"hits": 1, "misses": 2, "size": 0}
+
+
+def test_per_key_ttl_override(clock):
+    cache = TTLCache(maxsize=4, ttl=10)
+    cache.set("short", 1, ttl=1)
+    cache.set("long", 2)
+
+    clock.value += 5
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+
+
+def test_set_refreshes_expiry(clock):
+    cache = TTLCache(maxsize=4, ttl=10)
+    cache.set("k", 1)
+    clock.value += 8
+    cache.set("k", 2)
+    clock.value += 8
+    assert cache.get("k") == 2
+
+
+def test_evicts_least_recently_used(clock):
+    cache = TTLCache(maxsize=2, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats["size"] == 2
+
+
+def test_falsy_values_are_cached(clock):
+    cache = TTLCache(maxsize=2, ttl=10)
+    cache.set("zero", 0)
+    assert cache.get("zero", "missing") == 0
+
+
+def test_clear(clock):
+    cache = TTLCache(maxsize=2, ttl=10)
+    cache.set("a", 1)
+    cache.clear()
+    assert cache.get("a") is None
+    assert cache.stats["size"] == 0
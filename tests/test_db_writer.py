@@ -0,0 +1,154 @@
+import threading
+from contextlib import contextmanager
+
+import pytest
+
+from walter import db_utils, db_writer
+
+
+def _record(price=1.0, news=("headline",), account_time=0, **order):
+    order_fields = {
+        "coin": "ETH",
+        "is_buy": False,
+        "size": None,
+        "leverage": None,
+        "tif": None,
+        "decision_action": "hold",
+        "thinking": "t",
+        "order_payload": None,
+        "order_placed": False,
+        **order,
+    }
+    return {
+        "captured_at": "2026-01-01T00:00:00Z",
+        "market": {"coin": "ETH", "current_price": price},
+        "account": {"withdrawable": "100.0", "time": account_time},
+        "news": list(news),
+        "order": order_fields,
+    }
+
+
+def _count(table: str) -> int:
+    return db_utils._get_conn().execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+
+
+@pytest.fixture
+def db():
+    db_utils.initialize_database()
+    assert db_writer.flush()
+    with db_utils.transaction() as conn:
+        for table in (
+            "order_attempts",
+            "market_snapshots",
+            "account_snapshots",
+            "news_summaries",
+        ):
+            conn.execute(f"DELETE FROM {table}")
+    db_writer._last_snapshots.clear()
+    yield
+    assert db_writer.flush()
+
+
+@pytest.fixture
+def gated_writer(monkeypatch):
+    """Hold the writer inside its first record until ``gate`` is set.
+
+    Records enqueued meanwhile pile up and are drained as one batch. Each
+    call to ``transaction`` is recorded in ``transactions``.
+    """
+    gate = threading.Event()
+    started = threading.Event()
+    transactions = []
+    real_write = db_writer._write_record
+    real_transaction = db_writer.transaction
+
+    def write(record, conn, seen):
+        started.set()
+        gate.wait(5)
+        real_write(record, conn, seen)
+
+    @contextmanager
+    def counting_transaction():
+        transactions.append(None)
+        with real_transaction() as conn:
+            yield conn
+
+    monkeypatch.setattr(db_writer, "_write_record", write)
+    monkeypatch.setattr(db_writer, "transaction", counting_transaction)
+    yield gate, started, transactions
+    gate.set()
+
+
+def test_writes_snapshots_and_links_order_attempt(db):
+    db_writer.enqueue(_record(price=2.5))
+    assert db_writer.flush()
+
+    row = db_utils._get_conn().execute(
+        "SELECT oa.decision_action, ms.current_price, acs.withdrawable, ns.summary "
+        "FROM order_attempts oa "
+        "JOIN market_snapshots ms ON oa.market_snapshot_id = ms.id "
+        "JOIN account_snapshots acs ON oa.account_snapshot_id = acs.id "
+        "JOIN news_summaries ns ON oa.news_snapshot_id = ns.id"
+    ).fetchone()
+    assert tuple(row) == ("hold", 2.5, 100.0, '["headline"]')
+
+
+def test_records_queued_while_busy_share_one_transaction(db, gated_writer):
+    gate, started, transactions = gated_writer
+    db_writer.enqueue(_record(price=1.0))
+    assert started.wait(5)
+    for price in (2.0, 3.0, 4.0):
+        db_writer.enqueue(_record(price=price))
+
+    gate.set()
+    assert db_writer.flush()
+    # The first record alone, then the three that queued behind it.
+    assert len(transactions) == 2
+    assert _count("order_attempts") == 4
+
+
+def test_flush_times_out_while_writes_are_pending(db, gated_writer):
+    gate, started, _ = gated_writer
+    db_writer.enqueue(_record())
+    assert started.wait(5)
+
+    assert db_writer.flush(timeout=0.05) is False
+    gate.set()
+    assert db_writer.flush()
+    assert _count("order_attempts") == 1
+
+
+def test_failed_batch_rolls_back_and_forgets_snapshot_ids(db, gated_writer):
+    gate, started, _ = gated_writer
+    db_writer.enqueue(_record())
+    assert started.wait(5)
+    # Unknown order field -> save_order_attempt raises mid-batch.
+    db_writer.enqueue(_record(price=2.0, bogus=True))
+    db_writer.enqueue(_record(price=3.0))  # queued behind the bad record
+
+    gate.set()
+    assert db_writer.flush()  # pending count drains even on failure
+    assert _count("order_attempts") == 1
+    assert _count("market_snapshots") == 1
+
+    # Rolled-back snapshot ids are not reused; the next write inserts afresh
+    # and links to committed rows only.
+    first_account_id = db_writer._last_snapshots["account"][1]
+    db_writer.enqueue(_record(price=5.0))
+    assert db_writer.flush()
+    linked = db_utils._get_conn().execute(
+        "SELECT account_snapshot_id FROM order_attempts ORDER BY id DESC LIMIT 1"
+    ).fetchone()[0]
+    assert linked == first_account_id
+    assert _count("account_snapshots") == 1
+
+
+def test_unchanged_account_and_news_reuse_rows(db):
+    db_writer.enqueue(_record(price=1.0, account_time=1))
+    db_writer.enqueue(_record(price=2.0, account_time=2))  # only time differs
+    db_writer.enqueue(_record(price=3.0, news=("other",), account_time=3))
+    assert db_writer.flush()
+
+    assert _count("market_snapshots") == 3
+    assert _count("account_snapshots") == 1
+    assert _count("news_summaries") == 2
@@ -0,0 +1,148 @@
+import orjson
+import pytest
+import requests
+
+from walter.LLM_API import LLMAPI, _JsonObjectScanner
+
+
+def _delta(content: str) -> bytes:
+    return b"data: " + orjson.dumps({"choices": [{"delta": {"content": content}}]})
+
+
+class FakeStream:
+    """Minimal stand-in for a streamed ``requests.Response``."""
+
+    def __init__(self, lines, error: Exception | None = None):
+        self.lines = lines
+        self.error = error
+        self.consumed = 0
+
+    def iter_lines(self):
+        for line in self.lines:
+            self.consumed += 1
+            yield line
+        if self.error is not None:
+            raise self.error
+
+
+# --- _JsonObjectScanner -----------------------------------------------------
+
+
+def test_scanner_ignores_braces_inside_strings():
+    scanner = _JsonObjectScanner()
+    assert scanner.feed('{"THINKING": "price } above {ema", ') is False
+    assert scanner.depth == 1
+    assert scanner.feed('"ACTION": "HOLD"}') is True
+
+
+def test_scanner_handles_escaped_quotes_and_backslashes():
+    scanner = _JsonObjectScanner()
+    # \" stays inside the string; \\ ends the escape so the next " closes it.
+    assert scanner.feed(r'{"a": "say \"}\" ok", "b": "dir\\"') is False
+    assert scanner.in_string is False
+    assert scanner.feed("}") is True
+
+
+def test_scanner_tracks_escape_across_chunks():
+    scanner = _JsonObjectScanner()
+    assert scanner.feed('{"a": "x\\') is False
+    assert scanner.feed('"}') is False  # escaped quote, brace still in string
+    assert scanner.feed('"}') is True
+
+
+def test_scanner_waits_for_outermost_object():
+    scanner = _JsonObjectScanner()
+    assert scanner.feed('{"ACTION_DETAILS": {"size": 1}') is False
+    assert scanner.feed("}") is True
+
+
+def test_scanner_ignores_stray_closing_brace_before_object():
+    scanner = _JsonObjectScanner()
+    assert scanner.feed("} {") is False
+    assert scanner.feed("}") is True
+
+
+# --- LLMAPI._read_stream -----------------------------------------------------
+
+
+def test_read_stream_joins_deltas_and_stops_at_closing_brace():
+    response = FakeStream(
+        [
+            b": OPENROUTER PROCESSING",
+            b"",
+            _delta('{"ACTION": '),
+            _delta('"HOLD"}'),
+            _delta(" trailing chatter"),
+            b"data: [DONE]",
+        ]
+    )
+    assert LLMAPI._read_stream(response) == '{"ACTION": "HOLD"}'
+    assert response.consumed == 4  # nothing read past the closing brace
+
+
+def test_read_stream_done_after_complete_object():
+    response = FakeStream([_delta("{"), _delta("}"), b"data: [DONE]"])
+    assert LLMAPI._read_stream(response) == "{}"
+
+
+def test_read_stream_done_before_any_content():
+    assert LLMAPI._read_stream(FakeStream([b"data: [DONE]"])) == ""
+
+
+def test_read_stream_truncated_inside_object():
+    response = FakeStream([_delta('{"ACTION": "BU')])
+    assert LLMAPI._read_stream(response) == '{"ACTION": "BU'
+
+
+def test_read_stream_truncated_by_done():
+    response = FakeStream([_delta('{"ACTION": '), b"data: [DONE]"])
+    assert LLMAPI._read_stream(response) == '{"ACTION":'
+
+
+def test_read_stream_error_event_keeps_text_received_so_far():
+    response = FakeStream(
+        [
+            _delta('{"ACTION": '),
+            b'data: {"error": {"message": "provider overloaded"}}',
+            _delta('"HOLD"}'),
+        ]
+    )
+    assert LLMAPI._read_stream(response) == '{"ACTION":'
+    assert response.consumed == 2
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        requests.exceptions.ChunkedEncodingError("connection dropped"),
+        requests.exceptions.ConnectionError("reset"),
+    ],
+)
+def test_read_stream_dropped_connection(error):
+    response = FakeStream([_delta('{"ACTION": ')], error=error)
+    assert LLMAPI._read_stream(response) == '{"ACTION":'
+
+
+def test_read_stream_malformed_event():
+    response = FakeStream([_delta("{"), b"data: {not json"])
+    assert LLMAPI._read_stream(response) == "{"
+
+
+def test_broken_stream_holds_without_a_second_request(monkeypatch):
+    llm = LLMAPI(api_key="test-key", model="test/model")
+    payloads = []
+
+    def post_completion(payload):
+        payloads.append(payload)
+        return LLMAPI._read_stream(
+            FakeStream(
+                [_delta('{"THINKING": "x", "ACTION": "BUY", ')],
+                error=requests.exceptions.ChunkedEncodingError("dropped"),
+            )
+        )
+
+    monkeypatch.setattr(llm, "_post_completion", post_completion)
+    decision = llm.decide(llm._call_openrouter("prompt"))
+    assert len(payloads) == 1  # the billed completion is never replayed
+    assert decision.action == "hold"
+    assert decision.execute is False
@@ -0,0 +1,123 @@
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+import orjson
+import pytest
+
+from walter import cache as cache_module
+from walter import market_data
+from walter.market_data import _candle_features, get_market_snapshot
+
+pd = pytest.importorskip("pandas")
+
+URL = "https://info.test/info"
+
+
+def _candles(n: int) -> list[dict]:
+    closes = 2000.0 + np.cumsum(np.sin(np.arange(n)) * 3.0)
+    return [{"c": str(c), "v": str(100.0 + i)} for i, c in enumerate(closes)]
+
+
+def _responses(candles: list[dict]) -> dict:
+    return {
+        "allMids": {"ETH": "2001.5"},
+        "candleSnapshot": candles,
+        "fundingHistory": [{"fundingRate": "0.00001"}, {"fundingRate": "0.00002"}],
+        "metaAndAssetCtxs": [
+            {"universe": [{"name": "ETH"}]},
+            [{"openInterest": "456.7"}],
+        ],
+        "recentTrades": [{"side": "B", "sz": "1.5"}, {"side": "A", "sz": "0.5"}],
+    }
+
+
+@pytest.fixture
+def info_server(monkeypatch):
+    """Fake Hyperliquid info endpoint; records every payload actually sent."""
+    server = SimpleNamespace(responses=_responses(_candles(24)), sent=[])
+
+    def post(url, data, timeout):
+        payload = orjson.loads(data)
+        server.sent.append(payload)
+        return SimpleNamespace(
+            content=orjson.dumps(server.responses[payload["type"]]),
+            raise_for_status=lambda: None,
+        )
+
+    monkeypatch.setattr(market_data.SESSION, "post", post)
+    market_data._post_cache.clear()
+    yield server
+    market_data._post_cache.clear()
+
+
+@pytest.mark.parametrize("n", [1, 2, 24])
+def test_candle_features_match_pandas(n):
+    closes = np.array([float(c["c"]) for c in _candles(n)])
+    series = pd.Series(closes)
+
+    ema10, ema20, volatility = _candle_features(closes)
+
+    assert ema10 == pytest.approx(series.ewm(span=10, adjust=True).mean().iloc[-1])
+    assert ema20 == pytest.approx(series.ewm(span=20, adjust=True).mean().iloc[-1])
+    expected_vol = series.pct_change().std()
+    if np.isnan(expected_vol):
+        assert np.isnan(volatility)
+    else:
+        assert volatility == pytest.approx(expected_vol)
+
+
+def test_sync_snapshot_works_inside_a_running_loop(info_server):
+    async def caller():
+        return get_market_snapshot("ETH", 900, URL)
+
+    snapshot = asyncio.run(caller())
+    assert snapshot["coin"] == "ETH"
+    assert snapshot["current_price"] == 2001.5
+
+
+def test_snapshot_without_candles_is_an_error(info_server):
+    info_server.responses["candleSnapshot"] = []
+    snapshot = get_market_snapshot("ETH", 900, URL)
+    assert snapshot == {"error": "No candles returned for 'ETH'"}
+
+
+def test_post_reuses_fresh_replies(info_server):
+    first = get_market_snapshot("ETH", 900, URL)
+    second = get_market_snapshot("ETH", 900, URL)
+
+    assert first == second
+    # allMids/recentTrades (1 s TTL) may expire between calls; the slower
+    # candle, funding and meta requests must be served from the cache.
+    sent_types = [p["type"] for p in info_server.sent]
+    for kind in ("candleSnapshot", "fundingHistory", "metaAndAssetCtxs"):
+        assert sent_types.count(kind) == 1
+
+
+def test_post_ttl_is_per_request_type(info_server, monkeypatch):
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(
+        cache_module, "time", SimpleNamespace(monotonic=lambda: now.value)
+    )
+    market_data._post(URL, {"type": "allMids"})
+    market_data._post(URL, {"type": "metaAndAssetCtxs", "coin": "ETH"})
+
+    now.value += 2
+    market_data._post(URL, {"type": "allMids"})
+    market_data._post(URL, {"type": "metaAndAssetCtxs", "coin": "ETH"})
+
+    assert [p["type"] for p in info_server.sent] == [
+        "allMids",
+        "metaAndAssetCtxs",
+        "allMids",
+    ]
+
+
+def test_post_key_payload_buckets_cache_without_changing_request(info_server):
+    sent = {"type": "fundingHistory", "coin": "ETH", "startTime": 1_234_567}
+    key = {"type": "fundingHistory", "coin": "ETH", "startTime": 1_200_000}
+
+    market_data._post(URL, sent, key)
+    market_data._post(URL, {**sent, "startTime": 1_234_999}, key)
+
+    assert info_server.sent == [sent]